@@ -28,13 +28,12 @@ from config import (
     PIPER_VOICES_DIR
 )
 from vision_model import get_model, MoondreamLocal
-from prompts import PROMPTS
+from prompts import PROMPTS, slide_ocr_prompt
 from models import ProjectState
 from audio import AudioController
 from video import VideoController
-from tts import PiperTTS, get_default_voice
+from tts import PiperTTS, clear_piper_cache, get_default_voice
 from audio_export import export_audio_description_track
-from platform_utils import play_audio_file
 from resources import get_resource_path, get_icon_path, is_frozen
 from download_voices import (
     ENGLISH_VOICES, download_voice, is_voice_downloaded,
@@ -793,19 +792,12 @@ class VoiceSelectionDialog:
         
         def do_preview():
             try:
-                # Generate audio
+                # Generate and play audio (streamed straight to the player when possible)
                 self.tts.set_voice(voice.path)
-                temp_wav = self.tts.synthesize_to_temp(text)
-                
-                # Play using cross-platform audio player
-                if not play_audio_file(temp_wav, blocking=True):
+                if not self.tts.synthesize_and_play(text):
                     self.dialog.after(0, lambda: self.status_label.config(
                         text="No audio player found"))
                 
-                # Clean up
-                if os.path.exists(temp_wav):
-                    os.unlink(temp_wav)
-                
                 self.dialog.after(0, lambda: self.status_label.config(text=""))
                 
             except Exception as e:
@@ -1655,8 +1647,13 @@ class VideoCaptionerApp:
         # UI state
         self.is_running = True
         self._updating_timeline = False
+        self._last_timeline_update = 0.0  # time.monotonic() of last timeline redraw
+        self._timeline_after_id = None  # Pending trailing timeline redraw
         self.selected_caption_id = None
         self.is_processing = False
+        self._last_captions_version = None  # project.version last shown in the list
+        self._autosaved_version = None  # project.version last written by autosave
+        self._fmt_time_cache = {}  # Whole seconds -> "HH:MM:SS"
         
         # Region selection state
         self.selection_start = None  # (x, y) when mouse pressed
@@ -1668,17 +1665,31 @@ class VideoCaptionerApp:
         self.current_preview_width = PREVIEW_WIDTH
         self.current_preview_height = PREVIEW_HEIGHT
         self._resize_after_id = None  # For debouncing resize events
+        self._preview_x_offset = 0  # Centering offsets, updated on resize
+        self._preview_y_offset = 0
+        
+        # Single-slot frame handoff from the video thread to the Tk thread
+        self._preview_slot = None  # Newest frame waiting to be drawn
+        self._preview_pending = False  # True while a drain is scheduled
+        self._preview_lock = threading.Lock()
+        self._resize_buf = None  # Reused preview buffers, sized to the preview
+        self._rgb_buf = None
         
         # Audio export state
         self.selected_voice_path = get_default_voice()
+        self._piper_voices_cache = None  # Filled by _warm_piper_cache
+        self._piper_available = None
         
         # Colors for dark mode
         self.colors = {"bg": DARK_BG, "bg2": DARK_BG_SECONDARY, "bg3": DARK_BG_TERTIARY,
                        "fg": DARK_FG, "fg2": DARK_FG_SECONDARY, "border": DARK_BORDER}
         
+        # Frames larger than the model's input are shrunk before description
+        self.video.set_analysis_size(*MoondreamLocal.INPUT_SIZE)
+        
         # Set up video callbacks
         self.video.set_callbacks(
-            on_frame=lambda f: self.root.after(0, lambda: self.update_preview(f)),
+            on_frame=self.update_preview,
             on_position=lambda: self.root.after(0, self.update_timeline_display),
             on_end=lambda: self.root.after(0, self.stop_playback)
         )
@@ -1691,6 +1702,7 @@ class VideoCaptionerApp:
         # Start background threads
         self.video.start_playback_thread()
         self.start_autosave_thread()
+        threading.Thread(target=self._warm_piper_cache, daemon=True).start()
         
         # Initialize Moondream connection
         self.root.after(100, self.initialize_moondream)
@@ -1936,6 +1948,7 @@ For Slides:
     
     def open_voice_download(self):
         """Open the voice download dialog"""
+        self._invalidate_piper_cache()
         dialog = VoiceDownloadDialog(self.root)
         if dialog.result:
             # Voices were downloaded - refresh the default voice if none selected
@@ -2615,6 +2628,15 @@ For Slides:
         self.current_preview_width = new_width
         self.current_preview_height = new_height
         
+        # Centering offsets only change on resize, so compute them here
+        # rather than querying the canvas size on every frame
+        self._preview_x_offset = (width - new_width) // 2
+        self._preview_y_offset = (height - new_height) // 2
+        
+        # Preview buffers are reallocated at the new size on the next frame
+        self._resize_buf = None
+        self._rgb_buf = None
+        
         # Refresh the current frame if we have one
         if self.video.last_frame is not None:
             self.update_preview(self.video.last_frame.copy())
@@ -2624,23 +2646,49 @@ For Slides:
     # =========================================================================
     
     def update_preview(self, frame):
+        """Queue a frame for display (safe to call from any thread).
+        
+        Only the newest pending frame is drawn; frames that arrive while the
+        Tk thread is busy replace the queued one and are dropped.
+        """
+        with self._preview_lock:
+            self._preview_slot = frame
+            if self._preview_pending:
+                return
+            self._preview_pending = True
+        self.root.after_idle(self._drain_preview)
+    
+    def _drain_preview(self):
+        """Draw the latest queued frame (runs on the Tk thread)"""
+        with self._preview_lock:
+            frame = self._preview_slot
+            self._preview_slot = None
+            self._preview_pending = False
+        if frame is not None:
+            self._apply_preview(frame)
+    
+    def _apply_preview(self, frame):
         """Update the video preview canvas"""
         try:
             # Use current dynamic dimensions
             width = self.current_preview_width
             height = self.current_preview_height
             
-            frame = cv2.resize(frame, (width, height))
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(frame)
+            # Reuse the output buffers while the preview size is unchanged
+            if self._resize_buf is None or self._resize_buf.shape[:2] != (height, width):
+                self._resize_buf = np.empty((height, width, 3), dtype=np.uint8)
+                self._rgb_buf = np.empty((height, width, 3), dtype=np.uint8)
+            
+            cv2.resize(frame, (width, height), dst=self._resize_buf)
+            # BGR -> RGB by reversing the channel axis (plain contiguous copy)
+            np.copyto(self._rgb_buf, self._resize_buf[..., ::-1])
+            image = Image.fromarray(self._rgb_buf)
             photo = ImageTk.PhotoImage(image)
             self.video_canvas.photo = photo
             
-            # Center the image in the canvas
-            canvas_width = self.video_canvas.winfo_width()
-            canvas_height = self.video_canvas.winfo_height()
-            x_offset = (canvas_width - width) // 2
-            y_offset = (canvas_height - height) // 2
+            # Center the image in the canvas (offsets cached on resize)
+            x_offset = self._preview_x_offset
+            y_offset = self._preview_y_offset
             
             if not hasattr(self, 'video_image_id'):
                 self.video_image_id = self.video_canvas.create_image(
@@ -2667,12 +2715,27 @@ For Slides:
             pass
     
     def update_timeline_display(self):
-        """Update timeline and time label"""
+        """Update timeline and time label (at most 60 times per second)"""
+        now = time.monotonic()
+        wait = self._last_timeline_update + 1 / 60 - now
+        if wait > 0:
+            # Too soon - schedule one trailing redraw so the latest position still shows
+            if self._timeline_after_id is None:
+                self._timeline_after_id = self.root.after(
+                    int(wait * 1000) + 1, self._flush_timeline_display)
+            return
+        self._last_timeline_update = now
+        
         self.time_label.config(text=self.format_time(self.video.current_position))
         self._updating_timeline = True
         self.timeline.set(self.video.current_position)
         self._updating_timeline = False
     
+    def _flush_timeline_display(self):
+        """Run a timeline redraw that was deferred by the rate limit"""
+        self._timeline_after_id = None
+        self.update_timeline_display()
+    
     def toggle_playback(self):
         if self.video.is_playing:
             self.stop_playback()
@@ -2697,7 +2760,8 @@ For Slides:
         if was_playing:
             self.stop_playback()
         self.video.seek(position)
-        self.audio.seek(position)
+        # Coalesced: scrubbing fires many seeks; start_playback re-seeks immediately
+        self.audio.seek_coalesced(position)
         if was_playing:
             self.start_playback()
     
@@ -2739,10 +2803,21 @@ For Slides:
             self.volume_var.set(self.audio.volume_before_mute)
     
     def format_time(self, seconds: float) -> str:
+        key = int(seconds)
+        cached = self._fmt_time_cache.get(key)
+        if cached is not None:
+            return cached
+        
         hours = int(seconds // 3600)
         minutes = int((seconds % 3600) // 60)
         secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        formatted = f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        
+        # Keep the cache bounded
+        if len(self._fmt_time_cache) > 10_000:
+            self._fmt_time_cache.clear()
+        self._fmt_time_cache[key] = formatted
+        return formatted
     
     # =========================================================================
     # DESCRIPTION GENERATION
@@ -2767,21 +2842,42 @@ For Slides:
         mode = self.mode_var.get()
         
         def describe_thread():
+            nonlocal frame
             import time as t
+            image = None
             try:
                 start = t.time()
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # OCR wants full resolution; the model alone doesn't need more
+                # than its input size
+                if mode != "slide_ocr":
+                    frame = self.video.resize_for_analysis(frame)
+                # get_frame_at_position hands us a private copy, so swap the
+                # channels in place rather than allocating another full frame
+                # (a cropped selection isn't contiguous and gets a new buffer)
+                dst = frame if frame.flags['C_CONTIGUOUS'] else None
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
                 image = Image.fromarray(rgb_frame)
+                # Only the PIL image is needed from here on - free the raw frames
+                # so they aren't pinned in memory through the model call
+                frame = None
+                del rgb_frame
                 
                 if mode == "slide_ocr":
                     self.root.after(0, lambda: self.processing_label.config(text="Extracting text..."))
-                    ocr_text = pytesseract.image_to_string(image).strip()
-                    prompt = self.custom_prompts[mode].format(ocr_text=ocr_text or "[No text detected]")
+                    # Grayscale + downscale large frames - OCR cost scales with pixel count
+                    ocr_img = image.convert('L')
+                    w, h = ocr_img.size
+                    if max(w, h) > 1600:
+                        ocr_img = ocr_img.resize((w // 2, h // 2), Image.BILINEAR)
+                    ocr_text = pytesseract.image_to_string(ocr_img).strip()
+                    del ocr_img
+                    prompt = slide_ocr_prompt(ocr_text or "[No text detected]", self.custom_prompts[mode])
                 else:
                     prompt = self.custom_prompts[mode]
                 
                 self.root.after(0, lambda: self.processing_label.config(text="Generating description..."))
                 result = self.model.query(image, prompt)
+                image = None
                 description = result["answer"]
                 
                 caption = self.project.add_caption(
@@ -2802,6 +2898,8 @@ For Slides:
                 short_msg = str(e)[:40]
                 self.root.after(0, lambda msg=short_msg, full=full_error: self.show_error_with_details(msg, full))
             finally:
+                frame = None
+                image = None
                 self.is_processing = False
                 self.root.after(0, self.update_button_states)
         
@@ -2839,9 +2937,13 @@ For Slides:
     def autosave(self):
         if not self.project.video_path:
             return
+        # Skip the write if nothing changed since the last autosave
+        if self.project.version == self._autosaved_version:
+            return
         try:
             autosave_path = self.project.video_path + ".captioner_autosave.json"
             self.project.save(autosave_path)
+            self._autosaved_version = self.project.version
         except Exception:
             pass
     
@@ -2850,22 +2952,34 @@ For Slides:
     # =========================================================================
     
     def refresh_captions_list(self):
+        # Nothing to do if the caption set hasn't changed since the last rebuild
+        if self._last_captions_version == self.project.version:
+            return
+        self._last_captions_version = self.project.version
+        
         self.captions_listbox.delete(0, tk.END)
         
+        lines = []
         for caption in self.project.captions:
-            time_str = self.format_time(caption.timestamp)
-            status = "[*]" if caption.is_reviewed else "[ ]"
-            max_chars = 120
-            text_preview = caption.text[:max_chars] + "..." if len(caption.text) > max_chars else caption.text
-            text_preview = text_preview.replace('\n', ' ')
-            
-            line1 = f"{status} [{time_str}]"
-            line2 = f"      {text_preview}"
-            
-            self.captions_listbox.insert(tk.END, line1)
-            self.captions_listbox.insert(tk.END, line2)
+            lines.extend(self._caption_list_lines(caption))
+        
+        # Single Tk call for the whole list
+        if lines:
+            self.captions_listbox.insert(tk.END, *lines)
         
         self.captions_count.config(text=f"({len(self.project.captions)} captions)")
+    
+    def _caption_list_lines(self, caption):
+        """Build the two listbox lines (header, preview) for a caption"""
+        time_str = self.format_time(caption.timestamp)
+        status = "[*]" if caption.is_reviewed else "[ ]"
+        max_chars = 120
+        text_preview = caption.text[:max_chars] + "..." if len(caption.text) > max_chars else caption.text
+        text_preview = text_preview.replace('\n', ' ')
+        
+        line1 = f"{status} [{time_str}]"
+        line2 = f"      {text_preview}"
+        return line1, line2
 
     def on_caption_select(self, event):
         selection = self.captions_listbox.curselection()
@@ -2880,8 +2994,7 @@ For Slides:
             line1_idx = idx * 2
             line2_idx = idx * 2 + 1
             self.captions_listbox.selection_clear(0, tk.END)
-            self.captions_listbox.selection_set(line1_idx)
-            self.captions_listbox.selection_set(line2_idx)
+            self.captions_listbox.selection_set(line1_idx, line2_idx)
             
             self.caption_editor.delete(1.0, tk.END)
             self.caption_editor.insert(tk.END, caption.text)
@@ -2914,8 +3027,7 @@ For Slides:
             if caption.id == caption_id:
                 line1_idx = i * 2
                 self.captions_listbox.selection_clear(0, tk.END)
-                self.captions_listbox.selection_set(line1_idx)
-                self.captions_listbox.selection_set(line1_idx + 1)
+                self.captions_listbox.selection_set(line1_idx, line1_idx + 1)
                 self.captions_listbox.see(line1_idx)
                 self.on_caption_select(None)
                 break
@@ -2935,9 +3047,30 @@ For Slides:
             messagebox.showerror("Error", "Invalid timestamp values")
             return
         
-        self.project.update_caption(self.selected_caption_id, new_text, new_timestamp)
-        self.refresh_captions_list()
-        self.select_caption(self.selected_caption_id)
+        old_idx = self.project.get_caption_index(self.selected_caption_id)
+        if old_idx is None:
+            return
+        # Patching rows in place is only safe if the list showed the
+        # project as it was before this edit (a refresh may still be queued)
+        list_current = self._last_captions_version == self.project.version
+        
+        caption = self.project.update_caption(self.selected_caption_id, new_text, new_timestamp)
+        idx = self.project.get_caption_index(self.selected_caption_id)
+        
+        if idx != old_idx or not list_current:
+            # Timestamp change moved the caption, or the list is stale - rebuild it
+            self.refresh_captions_list()
+            self.select_caption(self.selected_caption_id)
+            return
+        
+        # Same position - just patch this caption's two rows
+        line1_idx = idx * 2
+        self.captions_listbox.delete(line1_idx, line1_idx + 1)
+        self.captions_listbox.insert(line1_idx, *self._caption_list_lines(caption))
+        self._last_captions_version = self.project.version
+        self.captions_listbox.selection_clear(0, tk.END)
+        self.captions_listbox.selection_set(line1_idx, line1_idx + 1)
+        self.captions_listbox.see(line1_idx)
     
     def increase_editor_font(self):
         """Increase caption editor font size"""
@@ -3065,25 +3198,28 @@ For Slides:
             messagebox.showwarning("Warning", "Please load a video first")
             return
         
-        # Check TTS availability
-        tts = PiperTTS()
-        voices = tts.discover_voices()
+        # Check TTS availability (cached by the startup warm-up thread)
+        if self._piper_voices_cache is None or self._piper_available is None:
+            self._warm_piper_cache()
+        voices = self._piper_voices_cache
         
         if not voices:
             # Show dialog offering to download voices
             no_voices = NoVoicesDialog(self.root, PIPER_VOICES_DIR)
             if no_voices.result == "download":
                 # Open voice download dialog
+                self._invalidate_piper_cache()
                 download_dialog = VoiceDownloadDialog(self.root)
+                self._warm_piper_cache()
                 if download_dialog.result:
                     # Voices were downloaded - refresh
-                    voices = tts.discover_voices()
+                    voices = self._piper_voices_cache
                     self.selected_voice_path = get_default_voice()
             
             if not voices:
                 return  # Still no voices
         
-        if not tts._find_piper():
+        if not self._piper_available:
             messagebox.showerror(
                 "Piper Not Found",
                 "Piper TTS executable not found.\n\n"
@@ -3165,6 +3301,18 @@ For Slides:
     # UTILITIES
     # =========================================================================
     
+    def _warm_piper_cache(self):
+        """Scan for Piper voices and executable (runs off the UI thread at startup)"""
+        tts = PiperTTS()
+        self._piper_voices_cache = tts.discover_voices()
+        self._piper_available = tts._find_piper() is not None
+    
+    def _invalidate_piper_cache(self):
+        """Forget cached Piper lookups so the next export re-scans"""
+        clear_piper_cache()
+        self._piper_voices_cache = None
+        self._piper_available = None
+    
     def update_button_states(self):
         video_loaded = self.video.cap is not None
         moondream_connected = self.model is not None
@@ -3,6 +3,8 @@ Audio playback controller using VLC
 """
 
 import logging
+import threading
+from collections import OrderedDict
 
 try:
     import vlc
@@ -15,6 +17,9 @@ from config import DEFAULT_VOLUME
 
 logger = logging.getLogger(__name__)
 
+MEDIA_CACHE_SIZE = 4  # Parsed VLC media objects kept for quick reloads
+SEEK_COALESCE_DELAY = 0.1  # Seconds to wait before applying a scrub seek
+
 
 class AudioController:
     """Handles audio playback using VLC"""
@@ -24,6 +29,10 @@ class AudioController:
         self.volume_before_mute = DEFAULT_VOLUME
         self.vlc_instance = None
         self.player = None
+        self._media_cache = OrderedDict()  # filepath -> vlc.Media (LRU order)
+        self._pending_seek_ms = None  # Latest coalesced seek target
+        self._seek_timer = None
+        self._seek_lock = threading.Lock()
         
         if not HAS_VLC:
             logger.warning("VLC not installed - audio playback disabled")
@@ -43,7 +52,15 @@ class AudioController:
         if not self.player:
             return
         try:
-            media = self.vlc_instance.media_new(filepath)
+            media = self._media_cache.pop(filepath, None)
+            if media is None:
+                media = self.vlc_instance.media_new(filepath)
+            self._media_cache[filepath] = media  # Most recently used last
+            
+            while len(self._media_cache) > MEDIA_CACHE_SIZE:
+                _, old_media = self._media_cache.popitem(last=False)
+                old_media.release()
+            
             self.player.set_media(media)
         except Exception as e:
             logger.error(f"Error loading audio: {e}")
@@ -67,12 +84,50 @@ class AudioController:
         """Seek to position in seconds"""
         if not self.player:
             return
+        self._cancel_pending_seek()
         try:
             # VLC set_time takes milliseconds
             self.player.set_time(int(position * 1000))
         except Exception:
             pass
     
+    def seek_coalesced(self, position: float):
+        """
+        Seek to position in seconds after a short delay.
+        
+        Rapid calls (e.g. while scrubbing the timeline) are merged so VLC
+        only performs one seek per SEEK_COALESCE_DELAY, to the latest target.
+        """
+        if not self.player:
+            return
+        with self._seek_lock:
+            self._pending_seek_ms = int(position * 1000)
+            if self._seek_timer is None:
+                self._seek_timer = threading.Timer(SEEK_COALESCE_DELAY, self._flush_seek)
+                self._seek_timer.daemon = True
+                self._seek_timer.start()
+    
+    def _flush_seek(self):
+        """Apply the latest coalesced seek (runs on the timer thread)"""
+        with self._seek_lock:
+            position_ms = self._pending_seek_ms
+            self._pending_seek_ms = None
+            self._seek_timer = None
+        if position_ms is None or not self.player:
+            return
+        try:
+            self.player.set_time(position_ms)
+        except Exception:
+            pass
+    
+    def _cancel_pending_seek(self):
+        """Drop any coalesced seek that hasn't been applied yet"""
+        with self._seek_lock:
+            if self._seek_timer is not None:
+                self._seek_timer.cancel()
+            self._seek_timer = None
+            self._pending_seek_ms = None
+    
     def set_volume(self, volume: int):
         """Set volume (0-100)"""
         if not self.player:
@@ -120,6 +175,10 @@ class AudioController:
     
     def release(self):
         """Release VLC resources"""
+        self._cancel_pending_seek()
+        for media in self._media_cache.values():
+            media.release()
+        self._media_cache.clear()
         if self.player:
             self.player.release()
         if self.vlc_instance:
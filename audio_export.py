@@ -6,12 +6,45 @@ The track matches the video duration with descriptions at their timestamps.
 """
 
 import os
+import subprocess
 import tempfile
-from typing import List, Callable, Optional
-from pydub import AudioSegment
+import threading
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+import numpy as np
 from models import Caption
+from platform_utils import find_ffmpeg, get_subprocess_flags
 from tts import PiperTTS
 
+# Default number of Piper processes run at once during export
+DEFAULT_TTS_CONCURRENCY = min(4, os.cpu_count() or 1)
+
+# Length of each window mixed and written at a time, so memory use doesn't
+# grow with video length
+MIX_CHUNK_SECONDS = 60
+
+
+def resample_samples(samples: np.ndarray, clip_rate: int, sample_rate: int) -> np.ndarray:
+    """
+    Linearly resample int16 samples to a new rate.
+    
+    Args:
+        samples: 1-D int16 array of samples
+        clip_rate: Sample rate of the input in Hz
+        sample_rate: Target sample rate in Hz
+        
+    Returns:
+        1-D int16 array of samples at sample_rate
+    """
+    if clip_rate == sample_rate or not len(samples):
+        return samples
+    
+    # e.g. 16 kHz "low" voices into a 22.05 kHz track
+    target_len = int(len(samples) * sample_rate / clip_rate)
+    positions = np.linspace(0, len(samples) - 1, target_len)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
 
 class AudioTrackExporter:
     """Exports captions as an audio description track"""
@@ -24,17 +57,9 @@ class AudioTrackExporter:
             tts: PiperTTS instance (creates default if None)
         """
         self.tts = tts or PiperTTS()
-        self._temp_files: List[str] = []
-    
-    def _cleanup_temp_files(self):
-        """Remove any temporary files"""
-        for path in self._temp_files:
-            try:
-                if os.path.exists(path):
-                    os.unlink(path)
-            except Exception:
-                pass
-        self._temp_files = []
+        # Per-export cache keyed by stripped caption text, so repeated
+        # phrases are synthesized only once
+        self._synth_cache: Dict[str, Future] = {}
     
     def export(
         self,
@@ -42,7 +67,8 @@ class AudioTrackExporter:
         video_duration: float,
         output_path: str,
         progress_callback: Callable[[int, int, str], None] = None,
-        sample_rate: int = 22050
+        sample_rate: int = 22050,
+        max_workers: int = None
     ) -> bool:
         """
         Export captions as an audio description track.
@@ -53,6 +79,7 @@ class AudioTrackExporter:
             output_path: Path to save the MP3 file
             progress_callback: Optional callback(current, total, message)
             sample_rate: Audio sample rate (default 22050 Hz)
+            max_workers: Parallel Piper processes (default: DEFAULT_TTS_CONCURRENCY)
             
         Returns:
             True on success
@@ -67,65 +94,188 @@ class AudioTrackExporter:
             raise ValueError("Invalid video duration")
         
         try:
-            total_steps = len(captions) + 2  # TTS for each + create base + export
+            total_samples = int(video_duration * sample_rate)
+            
+            # Only captions with text that start before the end of the track
+            # produce audio; drop the rest up front so progress counts match
+            voiced = [
+                (int(c.timestamp * sample_rate), c.text)
+                for c in captions
+                if c.text.strip()
+            ]
+            voiced = [(start, text) for start, text in voiced if start < total_samples]
+            
+            total_steps = len(voiced) + 2  # TTS for each + create base + export
             current_step = 0
+            progress_lock = threading.Lock()
             
             def update_progress(message: str):
                 nonlocal current_step
-                current_step += 1
+                # Called from worker threads as syntheses finish
+                with progress_lock:
+                    current_step += 1
+                    step = current_step
                 if progress_callback:
-                    progress_callback(current_step, total_steps, message)
+                    progress_callback(step, total_steps, message)
             
-            # Step 1: Create silent base track matching video duration
+            # Step 1: Size the silent base track to the video duration
             update_progress("Creating base audio track...")
-            duration_ms = int(video_duration * 1000)
-            base_track = AudioSegment.silent(duration=duration_ms, frame_rate=sample_rate)
             
-            # Step 2: Generate TTS for each caption and overlay
-            sorted_captions = sorted(captions, key=lambda c: c.timestamp)
+            # Step 2: Generate TTS for every caption in parallel, then mix.
+            # Each Piper run is an independent subprocess. Mixing happens only
+            # once all clips are in, walking the buffer front to back.
+            workers = max_workers or DEFAULT_TTS_CONCURRENCY
             
-            for i, caption in enumerate(sorted_captions):
-                update_progress(f"Generating audio {i+1}/{len(captions)}...")
-                
-                # Skip empty captions
-                if not caption.text.strip():
-                    continue
-                
-                # Generate TTS audio
-                temp_wav = self.tts.synthesize_to_temp(caption.text)
-                self._temp_files.append(temp_wav)
-                
-                # Load the generated audio
-                description_audio = AudioSegment.from_wav(temp_wav)
-                
-                # Calculate position in milliseconds
-                position_ms = int(caption.timestamp * 1000)
-                
-                # Ensure we don't go past the end
-                if position_ms >= duration_ms:
-                    continue
+            captions_done = 0
+            
+            def caption_finished():
+                nonlocal captions_done
+                with progress_lock:
+                    captions_done += 1
+                    done = captions_done
+                update_progress(f"Generating audio {done}/{len(voiced)}...")
+            
+            voice_rate = self.tts.get_sample_rate()
+            
+            def synthesize(text):
+                # Raw PCM straight from Piper, already at the track's rate
+                clip = self.tts.synthesize_to_array(text)
+                return resample_samples(clip, voice_rate, sample_rate)
+            
+            # Phase 1: synthesize, collecting (start_sample, clip) pairs
+            pending = []  # (start_sample, future)
+            pool = ThreadPoolExecutor(max_workers=workers)
+            try:
+                for start, text in voiced:
+                    # Repeated phrases share one synthesis
+                    key = text.strip()
+                    future = self._synth_cache.get(key)
+                    if future is None:
+                        future = pool.submit(synthesize, text)
+                        self._synth_cache[key] = future
+                    future.add_done_callback(lambda f: caption_finished())
+                    pending.append((start, future))
                 
-                # Overlay at the correct position
-                base_track = base_track.overlay(description_audio, position=position_ms)
+                clips = [(start, future.result()) for start, future in pending]
+            finally:
+                # On failure, drop queued syntheses and wait for running ones
+                pool.shutdown(wait=True, cancel_futures=True)
             
-            # Step 3: Export as MP3
+            # Step 3: Export as MP3. Phase 2 (mixing) runs as the encoder
+            # consumes chunks, in ascending start order.
             update_progress("Exporting MP3...")
             
+            clips.sort(key=lambda item: item[0])
+            chunks = self._mix_chunks(clips, total_samples, MIX_CHUNK_SECONDS * sample_rate)
+            
             # Determine output format from extension
             output_ext = os.path.splitext(output_path)[1].lower()
             
-            if output_ext == '.mp3':
-                base_track.export(output_path, format='mp3', bitrate='192k')
-            elif output_ext == '.wav':
-                base_track.export(output_path, format='wav')
+            if output_ext == '.wav':
+                self._write_wav(chunks, output_path, sample_rate)
             else:
-                # Default to MP3
-                base_track.export(output_path, format='mp3', bitrate='192k')
+                # MP3 (also the default for unknown extensions)
+                self._encode_mp3(chunks, output_path, sample_rate)
             
             return True
             
         finally:
-            self._cleanup_temp_files()
+            self._synth_cache.clear()
+    
+    def _mix_chunks(
+        self,
+        clips: List[Tuple[int, np.ndarray]],
+        total_samples: int,
+        chunk_samples: int
+    ) -> Iterator[np.ndarray]:
+        """
+        Mix clips into the track one fixed-size window at a time.
+        
+        Args:
+            clips: (start_sample, int16 samples) pairs sorted by start
+            total_samples: Length of the full track in samples
+            chunk_samples: Window size in samples
+            
+        Yields:
+            Consecutive int16 chunks covering the whole track
+        """
+        next_clip = 0
+        active = []  # Clips that started before this window and may still be playing
+        
+        for chunk_start in range(0, total_samples, chunk_samples):
+            chunk_end = min(chunk_start + chunk_samples, total_samples)
+            
+            while next_clip < len(clips) and clips[next_clip][0] < chunk_end:
+                active.append(clips[next_clip])
+                next_clip += 1
+            
+            # int32 gives headroom for overlapping clips; clipped per chunk
+            mix = np.zeros(chunk_end - chunk_start, dtype=np.int32)
+            still_active = []
+            for start, clip in active:
+                # Clips spanning a boundary contribute to each window they overlap
+                lo = max(start, chunk_start)
+                hi = min(start + len(clip), chunk_end)
+                mix[lo - chunk_start:hi - chunk_start] += clip[lo - start:hi - start]
+                if start + len(clip) > chunk_end:
+                    still_active.append((start, clip))
+            active = still_active
+            
+            yield np.clip(mix, -32768, 32767).astype(np.int16)
+    
+    def _write_wav(self, chunks: Iterable[np.ndarray], output_path: str, sample_rate: int):
+        """Write mono int16 sample chunks to a WAV file"""
+        with wave.open(output_path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            for pcm in chunks:
+                wav.writeframes(pcm.tobytes())
+    
+    def _encode_mp3(self, chunks: Iterable[np.ndarray], output_path: str, sample_rate: int):
+        """
+        Encode mono int16 sample chunks to MP3 by piping raw PCM into ffmpeg.
+        
+        No intermediate WAV file is written.
+        
+        Raises:
+            RuntimeError: If ffmpeg is missing or fails
+        """
+        ffmpeg = find_ffmpeg()
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg not found - required for MP3 export")
+        
+        cmd = [
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0',
+            '-b:a', '192k', output_path,
+        ]
+        # stderr goes to a temp file rather than a pipe: with stdin written
+        # incrementally, nothing would drain a pipe and ffmpeg could block on it
+        with tempfile.TemporaryFile() as errors:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=errors,
+                **get_subprocess_flags()
+            )
+            try:
+                for pcm in chunks:
+                    proc.stdin.write(pcm.tobytes())
+            except BrokenPipeError:
+                pass  # ffmpeg exited early - reported via its return code below
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                proc.wait()
+            
+            if proc.returncode != 0:
+                errors.seek(0)
+                error = errors.read().decode('utf-8', errors='replace').strip()
+                raise RuntimeError(f"ffmpeg failed: {error}")
     
     def estimate_duration(self, captions: List[Caption]) -> float:
         """
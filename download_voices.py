@@ -11,10 +11,14 @@ Usage (command line):
 """
 
 import os
+import re
 import sys
 import argparse
+import socket
+import threading
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Callable, Optional, Tuple
 
 # Base URL for Piper voices
@@ -63,6 +67,15 @@ ENGLISH_VOICES = [
 ]
 
 
+# Read size per response.read() and userspace write buffer for downloads.
+# Large blocks keep syscall counts low on 16-46 MB model files.
+DOWNLOAD_BLOCK_SIZE = 256 * 1024
+DOWNLOAD_WRITE_BUFFER = 1024 * 1024
+
+# Voices downloaded at once from the command line
+PARALLEL_DOWNLOADS = 4
+
+
 def get_voice_filename(locale: str, name: str, quality: str) -> str:
     """Get the base filename for a voice (without extension)"""
     return f"{locale}-{name}-{quality}"
@@ -95,11 +108,62 @@ def get_size_estimate(quality: str) -> int:
     return SIZE_ESTIMATES.get(quality, 17)
 
 
+def _enlarge_receive_buffer(response) -> None:
+    """Ask the OS for a larger socket receive buffer (best effort)"""
+    try:
+        sock = response.fp.raw._sock
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DOWNLOAD_WRITE_BUFFER)
+    except (AttributeError, OSError):
+        # Internals differ across Python versions / platforms - not critical
+        pass
+
+
+def _read_validator(validator_path: str) -> Optional[str]:
+    """Read the ETag/Last-Modified saved for a .part file, if any"""
+    try:
+        with open(validator_path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(validator_path: str, response) -> None:
+    """Save the response's ETag (or Last-Modified) for a later If-Range resume"""
+    etag = response.headers.get('ETag')
+    # Weak ETags can't be used with If-Range
+    validator = etag if etag and not etag.startswith('W/') else response.headers.get('Last-Modified')
+    if validator:
+        with open(validator_path, 'w', encoding='utf-8') as f:
+            f.write(validator)
+    else:
+        _remove(validator_path)
+
+
+def _range_start(response) -> int:
+    """Get the first byte offset from a 206 response's Content-Range header"""
+    match = re.match(r'bytes (\d+)-', response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else -1
+
+
+def _remove(path: str) -> None:
+    """Delete a file, ignoring errors"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
 def download_file(url: str, dest_path: str, 
                   progress_callback: Optional[Callable[[int, int], None]] = None) -> bool:
     """
     Download a file with optional progress callback.
     
+    Data is written to "<dest_path>.part" and renamed into place when
+    complete. If a previous attempt left a .part file behind, the download
+    resumes from where it stopped using an HTTP Range request. The resume
+    is conditional (If-Range) on the ETag/Last-Modified saved alongside the
+    .part file, so a file that changed on the server is fetched from scratch.
+    
     Args:
         url: URL to download
         dest_path: Local path to save file
@@ -108,18 +172,44 @@ def download_file(url: str, dest_path: str,
     Returns:
         True on success, False on failure
     """
+    part_path = dest_path + '.part'
+    validator_path = part_path + '.etag'
+    
     try:
         os.makedirs(os.path.dirname(dest_path), exist_ok=True)
         
+        existing = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = _read_validator(validator_path) if existing else None
+        
         request = urllib.request.Request(url)
         request.add_header('User-Agent', 'PADLE Voice Downloader/1.0')
+        if existing and validator:
+            # Only resume if the server still has the same file; otherwise
+            # it answers 200 with the full body and we start over
+            request.add_header('Range', f'bytes={existing}-')
+            request.add_header('If-Range', validator)
         
         with urllib.request.urlopen(request, timeout=60) as response:
             total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            block_size = 8192
+            if response.status == 206:
+                if _range_start(response) != existing:
+                    # Not the range we asked for - discard and restart next time
+                    _remove(part_path)
+                    _remove(validator_path)
+                    return False
+                # Server honoured the range - append to the partial file
+                mode = 'ab'
+                downloaded = existing
+                total_size += existing
+            else:
+                # Full response - start over
+                mode = 'wb'
+                downloaded = 0
+                _write_validator(validator_path, response)
+            block_size = DOWNLOAD_BLOCK_SIZE
+            _enlarge_receive_buffer(response)
             
-            with open(dest_path, 'wb') as f:
+            with open(part_path, mode, buffering=DOWNLOAD_WRITE_BUFFER) as f:
                 while True:
                     chunk = response.read(block_size)
                     if not chunk:
@@ -129,15 +219,19 @@ def download_file(url: str, dest_path: str,
                     if progress_callback:
                         progress_callback(downloaded, total_size)
         
+        os.replace(part_path, dest_path)
+        _remove(validator_path)
         return True
         
-    except (urllib.error.URLError, urllib.error.HTTPError, OSError, TimeoutError) as e:
-        # Clean up partial download
-        if os.path.exists(dest_path):
-            try:
-                os.unlink(dest_path)
-            except OSError:
-                pass
+    except urllib.error.HTTPError as e:
+        if e.code == 416 and os.path.exists(part_path):
+            # Range not satisfiable - the partial file is unusable, restart next time
+            _remove(part_path)
+            _remove(validator_path)
+        return False
+        
+    except (urllib.error.URLError, OSError, TimeoutError):
+        # Keep the .part file so a retry can resume
         return False
 
 
@@ -170,20 +264,29 @@ def download_voice(voice_dir: str, locale: str, name: str, quality: str,
         if progress_callback:
             progress_callback(onnx_filename, downloaded, total)
     
-    if not os.path.exists(onnx_path):
-        if not download_file(onnx_url, onnx_path, onnx_progress):
-            return False
+    # Fetch the small JSON config alongside the ONNX so its request
+    # round-trip overlaps the large transfer
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        onnx_future = json_future = None
+        if not os.path.exists(onnx_path):
+            onnx_future = pool.submit(download_file, onnx_url, onnx_path, onnx_progress)
+        if not os.path.exists(json_path):
+            json_future = pool.submit(download_file, json_url, json_path)
+        
+        onnx_ok = onnx_future.result() if onnx_future else True
+        json_ok = json_future.result() if json_future else True
     
-    # Download JSON config (small)
-    if not os.path.exists(json_path):
-        if not download_file(json_url, json_path):
-            # Clean up onnx if json fails
-            if os.path.exists(onnx_path):
-                try:
-                    os.unlink(onnx_path)
-                except OSError:
-                    pass
-            return False
+    if not onnx_ok:
+        return False
+    
+    if not json_ok:
+        # Clean up onnx if json fails
+        if os.path.exists(onnx_path):
+            try:
+                os.unlink(onnx_path)
+            except OSError:
+                pass
+        return False
     
     return True
 
@@ -274,22 +377,34 @@ def main():
     success_count = 0
     fail_count = 0
     
-    for locale, name, quality in voices_to_download:
-        print(f"\n[{locale}] {name} ({quality})")
-        
-        def show_progress(filename, downloaded, total):
-            if total > 0:
-                pct = (downloaded / total) * 100
-                mb_down = downloaded / (1024 * 1024)
-                mb_total = total / (1024 * 1024)
-                print(f"\r  {filename}: {mb_down:.1f}/{mb_total:.1f} MB ({pct:.0f}%)", end="", flush=True)
+    # Combined progress across all in-flight downloads: filename -> (done, total)
+    file_progress = {}
+    progress_lock = threading.Lock()
+    
+    def show_progress(filename, downloaded, total):
+        with progress_lock:
+            file_progress[filename] = (downloaded, total)
+            mb_down = sum(d for d, _ in file_progress.values()) / (1024 * 1024)
+            mb_total = sum(t for _, t in file_progress.values()) / (1024 * 1024)
+            print(f"\r  Downloading: {mb_down:.1f}/{mb_total:.1f} MB", end="", flush=True)
+    
+    with ThreadPoolExecutor(max_workers=PARALLEL_DOWNLOADS) as pool:
+        futures = {
+            pool.submit(download_voice, args.dir, locale, name, quality, show_progress):
+                (locale, name, quality)
+            for locale, name, quality in voices_to_download
+        }
         
-        if download_voice(args.dir, locale, name, quality, show_progress):
-            print()  # Newline after progress
-            success_count += 1
-        else:
-            print("\n  Failed!")
-            fail_count += 1
+        for future in as_completed(futures):
+            locale, name, quality = futures[future]
+            ok = future.result()
+            with progress_lock:
+                status = "OK" if ok else "Failed!"
+                print(f"\r[{locale}] {name} ({quality}): {status}".ljust(60))
+            if ok:
+                success_count += 1
+            else:
+                fail_count += 1
     
     print(f"\n{'='*50}")
     print(f"Download complete!")
@@ -2,10 +2,21 @@
 Data models for Video Captioner
 """
 
+import io
 import json
-from dataclasses import dataclass, asdict
+import numpy as np
+from dataclasses import dataclass
 from typing import List, Optional, Dict
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# File buffer for project saves and exports
+WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 @dataclass
 class Caption:
@@ -18,7 +29,15 @@ class Caption:
     is_reviewed: bool = False  # True if human has reviewed
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Explicit literal - asdict() recurses and deep-copies every field
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "text": self.text,
+            "mode": self.mode,
+            "is_generated": self.is_generated,
+            "is_reviewed": self.is_reviewed,
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Caption':
@@ -30,10 +49,14 @@ class ProjectState:
     
     def __init__(self):
         self.video_path: Optional[str] = None
-        self.captions: List[Caption] = []
+        self.captions: List[Caption] = []  # Kept sorted by timestamp
+        self._by_id: Dict[int, Caption] = {}
+        # Start times parallel to self.captions, for vectorized/binary-search access
+        self._timestamps: np.ndarray = np.empty(0, dtype=np.float64)
         self.next_caption_id: int = 1
         self.last_save_path: Optional[str] = None
         self.custom_prompts: Optional[Dict[str, str]] = None  # None means use defaults
+        self.version: int = 0  # Bumped whenever the caption set changes
     
     def add_caption(self, timestamp: float, text: str, mode: str, 
                     is_generated: bool = False) -> Caption:
@@ -45,36 +68,63 @@ class ProjectState:
             is_generated=is_generated,
             is_reviewed=not is_generated
         )
-        self.captions.append(caption)
+        self._insert_sorted(caption)
+        self._by_id[caption.id] = caption
         self.next_caption_id += 1
-        # Keep captions sorted by timestamp
-        self.captions.sort(key=lambda c: c.timestamp)
+        self.version += 1
         return caption
     
     def update_caption(self, caption_id: int, text: str, timestamp: float = None) -> Optional[Caption]:
-        for caption in self.captions:
-            if caption.id == caption_id:
-                caption.text = text
-                caption.is_reviewed = True
-                if timestamp is not None:
-                    caption.timestamp = timestamp
-                    # Re-sort captions by timestamp
-                    self.captions.sort(key=lambda c: c.timestamp)
-                return caption
-        return None
+        caption = self._by_id.get(caption_id)
+        if caption is None:
+            return None
+        caption.text = text
+        caption.is_reviewed = True
+        if timestamp is not None and timestamp != caption.timestamp:
+            # Move to its new position to keep captions sorted by timestamp
+            self._remove_at(self._index_of(caption))
+            caption.timestamp = timestamp
+            self._insert_sorted(caption)
+        self.version += 1
+        return caption
     
     def delete_caption(self, caption_id: int) -> bool:
-        for i, caption in enumerate(self.captions):
-            if caption.id == caption_id:
-                self.captions.pop(i)
-                return True
-        return False
+        caption = self._by_id.pop(caption_id, None)
+        if caption is None:
+            return False
+        self._remove_at(self._index_of(caption))
+        self.version += 1
+        return True
     
     def get_caption_by_id(self, caption_id: int) -> Optional[Caption]:
-        for caption in self.captions:
-            if caption.id == caption_id:
-                return caption
-        return None
+        return self._by_id.get(caption_id)
+    
+    def get_caption_index(self, caption_id: int) -> Optional[int]:
+        """Position of a caption in self.captions (binary search), or None if unknown"""
+        caption = self._by_id.get(caption_id)
+        return None if caption is None else self._index_of(caption)
+    
+    def get_caption_at(self, position: float) -> Optional[Caption]:
+        """Latest caption starting at or before position (seconds), if any"""
+        idx = int(np.searchsorted(self._timestamps, position, side='right'))
+        return self.captions[idx - 1] if idx else None
+    
+    def _insert_sorted(self, caption: Caption):
+        """Insert after any captions with the same timestamp (binary search)"""
+        idx = int(np.searchsorted(self._timestamps, caption.timestamp, side='right'))
+        self.captions.insert(idx, caption)
+        self._timestamps = np.insert(self._timestamps, idx, caption.timestamp)
+    
+    def _index_of(self, caption: Caption) -> int:
+        """Position of caption in self.captions, searching only its timestamp run"""
+        idx = int(np.searchsorted(self._timestamps, caption.timestamp, side='left'))
+        while self.captions[idx] is not caption:
+            idx += 1
+        return idx
+    
+    def _remove_at(self, idx: int):
+        del self.captions[idx]
+        self._timestamps = np.delete(self._timestamps, idx)
     
     def to_dict(self) -> dict:
         data = {
@@ -88,46 +138,76 @@ class ProjectState:
         return data
     
     def save(self, filepath: str):
-        with open(filepath, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        # Serialize in memory and write once rather than streaming many
+        # small chunks through json.dump
+        if HAS_ORJSON:
+            payload = orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(self.to_dict(), indent=2).encode('utf-8')
+        with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(payload)
         self.last_save_path = filepath
     
     def load(self, filepath: str):
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        # orjson writes UTF-8 unescaped; json.loads detects the encoding of bytes too
+        data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
         self.video_path = data.get("video_path")
         self.captions = [Caption.from_dict(c) for c in data.get("captions", [])]
+        self._timestamps = np.fromiter(
+            (c.timestamp for c in self.captions), dtype=np.float64, count=len(self.captions)
+        )
+        order = np.argsort(self._timestamps, kind='stable')
+        self.captions = [self.captions[i] for i in order]
+        self._timestamps = self._timestamps[order]
+        self._by_id = {c.id: c for c in self.captions}
         self.next_caption_id = data.get("next_caption_id", 1)
         self.custom_prompts = data.get("custom_prompts")  # None if not in file
         self.last_save_path = filepath
+        self.version += 1
     
     def export_webvtt(self, filepath: str, default_duration: float = 10.0):
         """Export captions to WebVTT format for Panopto"""
-        lines = ["WEBVTT", ""]
+        buf = io.StringIO()
+        buf.write("WEBVTT\n\n")
+        
+        # Consecutive timestamps usually share hour and minute, so reuse
+        # the "HH:MM:" prefix instead of formatting it every time
+        prefix_key = None
+        prefix = ""
+        
+        def format_ts(seconds: float) -> str:
+            nonlocal prefix_key, prefix
+            h, rem = divmod(seconds, 3600)
+            m, secs = divmod(rem, 60)
+            if (h, m) != prefix_key:
+                prefix_key = (h, m)
+                prefix = f"{int(h):02d}:{int(m):02d}:"
+            return f"{prefix}{secs:06.3f}"
         
-        for i, caption in enumerate(self.captions):
-            # Calculate end time
-            if i + 1 < len(self.captions):
-                # End at next caption or after default duration, whichever is sooner
-                next_start = self.captions[i + 1].timestamp
-                end_time = min(caption.timestamp + default_duration, next_start)
-            else:
-                # Last caption - use default duration based on text length
-                words = len(caption.text.split())
-                duration = max(default_duration, words * 0.4)  # ~150 words/min
-                end_time = caption.timestamp + duration
+        count = len(self.captions)
+        if count:
+            # End each caption at the next one's start or after the default
+            # duration, whichever is sooner - computed for all captions at once
+            starts = self._timestamps
+            # Last caption - use default duration based on text length
+            words = len(self.captions[-1].text.split())
+            last_end = starts[-1] + max(default_duration, words * 0.4)  # ~150 words/min
+            next_starts = np.append(starts[1:], last_end)
+            end_times = np.minimum(starts + default_duration, next_starts)
+            end_times[-1] = last_end
             
-            lines.append(str(i + 1))
-            lines.append(f"{self._format_timestamp(caption.timestamp)} --> {self._format_timestamp(end_time)}")
-            lines.append(caption.text)
-            lines.append("")
+            for i, (caption, end_time) in enumerate(zip(self.captions, end_times.tolist())):
+                buf.write(f"{i + 1}\n{format_ts(caption.timestamp)} --> {format_ts(end_time)}\n{caption.text}\n\n")
         
-        with open(filepath, 'w') as f:
-            f.write('\n'.join(lines))
+        # Cues are separated by blank lines; no extra one after the last cue
+        payload = buf.getvalue()[:-1] if count else "WEBVTT\n"
+        with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(payload)
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format seconds as HH:MM:SS.mmm"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
\ No newline at end of file
+        hours, rem = divmod(seconds, 3600)
+        minutes, secs = divmod(rem, 60)
+        return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
\ No newline at end of file
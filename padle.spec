@@ -64,7 +64,6 @@ hiddenimports = [
     'pytesseract',
     
     # Audio
-    'pydub',
     'vlc',
     
     # TTS
@@ -9,22 +9,42 @@ import os
 import sys
 import subprocess
 import shutil
+import functools
 from typing import Optional
 
+try:
+    import winsound  # Windows only
+    HAS_WINSOUND = True
+except ImportError:
+    HAS_WINSOUND = False
+    winsound = None
+
+# The platform can't change while running, so decide it once
+IS_WINDOWS = sys.platform == 'win32'
+IS_MACOS = sys.platform == 'darwin'
+IS_LINUX = sys.platform.startswith('linux')
+
+# Environment-derived locations, resolved once (expanduser may hit the
+# passwd database). Call refresh_env() after changing these variables.
+_HOME = os.path.expanduser('~')
+_LOCALAPPDATA = os.environ.get('LOCALAPPDATA')
+_PROGRAMFILES = os.environ.get('PROGRAMFILES')
+_VIRTUAL_ENV = os.environ.get('VIRTUAL_ENV')
+
 
 def is_windows() -> bool:
     """Check if running on Windows"""
-    return sys.platform == 'win32'
+    return IS_WINDOWS
 
 
 def is_macos() -> bool:
     """Check if running on macOS"""
-    return sys.platform == 'darwin'
+    return IS_MACOS
 
 
 def is_linux() -> bool:
     """Check if running on Linux"""
-    return sys.platform.startswith('linux')
+    return IS_LINUX
 
 
 def get_exe_extension() -> str:
@@ -74,10 +94,20 @@ def play_audio_file(filepath: str, blocking: bool = True) -> bool:
     
     try:
         if is_windows():
-            # Windows: Use the built-in Windows Media Player command line
-            # or PowerShell's audio playback
+            # WAV (what Piper produces): play in-process with winsound,
+            # avoiding a PowerShell launch that costs hundreds of ms
+            if HAS_WINSOUND and filepath.lower().endswith('.wav'):
+                try:
+                    flags = winsound.SND_FILENAME
+                    if not blocking:
+                        flags |= winsound.SND_ASYNC
+                    winsound.PlaySound(filepath, flags)
+                    return True
+                except Exception:
+                    pass
+            
+            # Other formats (or winsound failed): PowerShell's audio playback
             try:
-                # Try using PowerShell's audio playback (works on all Windows)
                 ps_cmd = f'(New-Object Media.SoundPlayer "{filepath}").PlaySync()'
                 subprocess.run(
                     ['powershell', '-Command', ps_cmd],
@@ -89,18 +119,6 @@ def play_audio_file(filepath: str, blocking: bool = True) -> bool:
             except (FileNotFoundError, subprocess.TimeoutExpired):
                 pass
             
-            # Fallback: Try winsound for WAV files
-            if filepath.lower().endswith('.wav'):
-                try:
-                    import winsound
-                    flags = winsound.SND_FILENAME
-                    if not blocking:
-                        flags |= winsound.SND_ASYNC
-                    winsound.PlaySound(filepath, flags)
-                    return True
-                except Exception:
-                    pass
-            
             # Last resort: open with default player
             os.startfile(filepath)
             return True
@@ -141,6 +159,36 @@ def play_audio_file(filepath: str, blocking: bool = True) -> bool:
         return False
 
 
+def get_raw_audio_player(sample_rate: int) -> Optional[list]:
+    """
+    Get a command that plays raw 16-bit mono PCM from stdin.
+    
+    Args:
+        sample_rate: Sample rate of the PCM stream in Hz
+        
+    Returns:
+        Command list, or None if no suitable player is installed
+        (Windows has none built in; afplay can't read stdin)
+    """
+    rate = str(sample_rate)
+    if is_linux():
+        players = [
+            ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-r', rate, '-c', '1', '-'],  # ALSA
+            ['paplay', '--raw', '--format=s16le', f'--rate={rate}', '--channels=1'],  # PulseAudio
+            ['play', '-q', '-t', 'raw', '-r', rate, '-e', 'signed', '-b', '16', '-c', '1', '-'],  # SoX
+        ]
+    else:
+        players = []
+    # ffmpeg's player works anywhere it's installed
+    players.append(['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet',
+                    '-f', 's16le', '-ar', rate, '-ac', '1', '-i', '-'])
+    
+    for cmd in players:
+        if shutil.which(cmd[0]):
+            return cmd
+    return None
+
+
 def get_default_voices_dir() -> str:
     """
     Get the default directory for Piper voice models.
@@ -150,12 +198,11 @@ def get_default_voices_dir() -> str:
     - macOS/Linux: ~/piper-voices
     """
     if is_windows():
-        local_app_data = os.environ.get('LOCALAPPDATA')
-        if local_app_data:
-            return os.path.join(local_app_data, 'piper-voices')
+        if _LOCALAPPDATA:
+            return os.path.join(_LOCALAPPDATA, 'piper-voices')
     
     # Default for macOS/Linux or Windows fallback
-    return os.path.expanduser('~/piper-voices')
+    return os.path.join(_HOME, 'piper-voices')
 
 
 def get_app_data_dir(app_name: str = "padle") -> str:
@@ -168,17 +215,40 @@ def get_app_data_dir(app_name: str = "padle") -> str:
     - Linux: ~/.local/share/{app_name}
     """
     if is_windows():
-        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+        base = _LOCALAPPDATA if _LOCALAPPDATA is not None else _HOME
         return os.path.join(base, app_name)
     elif is_macos():
-        return os.path.expanduser(f'~/Library/Application Support/{app_name}')
+        return os.path.join(_HOME, 'Library', 'Application Support', app_name)
     else:
-        return os.path.expanduser(f'~/.local/share/{app_name}')
+        return os.path.join(_HOME, '.local', 'share', app_name)
+
 
+def _cache_if_found(func):
+    """
+    Cache a no-argument lookup once it finds something.
+    
+    A None result isn't cached, so a tool installed while the app is
+    running is picked up on the next call without a restart.
+    """
+    found = []
+    
+    @functools.wraps(func)
+    def wrapper():
+        if not found:
+            result = func()
+            if result is None:
+                return None
+            found.append(result)
+        return found[0]
+    
+    wrapper.cache_clear = found.clear
+    return wrapper
 
+
+@_cache_if_found
 def find_ffmpeg() -> Optional[str]:
     """
-    Find the ffmpeg executable.
+    Find the ffmpeg executable (cached once found; see clear_dependency_cache).
     
     Returns:
         Path to ffmpeg or None if not found
@@ -191,8 +261,8 @@ def find_ffmpeg() -> Optional[str]:
     # Check common locations
     if is_windows():
         common_paths = [
-            os.path.join(os.environ.get('LOCALAPPDATA', ''), 'ffmpeg', 'bin', 'ffmpeg.exe'),
-            os.path.join(os.environ.get('PROGRAMFILES', ''), 'ffmpeg', 'bin', 'ffmpeg.exe'),
+            os.path.join(_LOCALAPPDATA or '', 'ffmpeg', 'bin', 'ffmpeg.exe'),
+            os.path.join(_PROGRAMFILES or '', 'ffmpeg', 'bin', 'ffmpeg.exe'),
             'C:\\ffmpeg\\bin\\ffmpeg.exe',
         ]
     elif is_macos():
@@ -213,45 +283,62 @@ def find_ffmpeg() -> Optional[str]:
     return None
 
 
-def find_piper() -> Optional[str]:
+def _piper_candidate_dirs() -> tuple:
+    """Common project venvs and (Linux/macOS) ~/.local/bin that may hold piper"""
+    # Fixed-shape paths we build ourselves, so plain interpolation is enough
+    sep = os.sep
+    bin_dir = get_venv_bin_dir()
+    dirs = tuple(
+        f"{_HOME}{sep}{proj_dir}{sep}{proj_name}{sep}venv{sep}{bin_dir}"
+        for proj_dir in ("Projects", "projects", "Dev", "dev")
+        for proj_name in ("leadr", "padle", "video-captioner")
+    )
+    if not is_windows():
+        dirs += (f"{_HOME}{sep}.local{sep}bin",)
+    return dirs
+
+
+# Built once; rebuilt by refresh_env()
+_PIPER_CANDIDATE_DIRS = _piper_candidate_dirs()
+
+
+def piper_search_path(prefer_venv: bool = False) -> str:
     """
-    Find the piper executable.
+    Build a PATH-style search string for locating piper with shutil.which.
+    
+    Covers PATH, the active virtual environment, common project venvs and
+    (on Linux/macOS) ~/.local/bin.
     
+    Args:
+        prefer_venv: Search the active virtual environment before PATH
+        
     Returns:
-        Path to piper or None if not found
+        Directories joined with os.pathsep
     """
-    exe_name = get_exe_name('piper')
-    
-    # Check if in PATH
-    piper = shutil.which(exe_name)
-    if piper:
-        return piper
-    
-    # Check current virtual environment
-    venv_path = os.environ.get("VIRTUAL_ENV")
-    if venv_path:
-        venv_piper = os.path.join(venv_path, get_venv_bin_dir(), exe_name)
-        if os.path.isfile(venv_piper):
-            return venv_piper
-    
-    # Check common project locations
-    home = os.path.expanduser("~")
-    project_dirs = ["Projects", "projects", "Dev", "dev"]
-    project_names = ["leadr", "padle", "video-captioner"]
+    venv_dirs = []
+    if _VIRTUAL_ENV:
+        venv_dirs.append(os.path.join(_VIRTUAL_ENV, get_venv_bin_dir()))
     
-    for proj_dir in project_dirs:
-        for proj_name in project_names:
-            venv_piper = os.path.join(home, proj_dir, proj_name, "venv", get_venv_bin_dir(), exe_name)
-            if os.path.isfile(venv_piper):
-                return venv_piper
+    path_dirs = [os.environ.get("PATH", "")]
+    extra_dirs = list(_PIPER_CANDIDATE_DIRS)
     
-    # User local bin (Linux/macOS)
-    if not is_windows():
-        local_piper = os.path.join(home, ".local", "bin", "piper")
-        if os.path.isfile(local_piper):
-            return local_piper
+    if prefer_venv:
+        dirs = venv_dirs + path_dirs + extra_dirs
+    else:
+        dirs = path_dirs + venv_dirs + extra_dirs
+    return os.pathsep.join(dirs)
+
+
+@_cache_if_found
+def find_piper() -> Optional[str]:
+    """
+    Find the piper executable (cached once found; see clear_dependency_cache).
     
-    return None
+    Returns:
+        Path to piper or None if not found
+    """
+    # One which() over the active venv, PATH and the usual project locations
+    return shutil.which(get_exe_name('piper'), path=piper_search_path(prefer_venv=True))
 
 
 def check_dependencies() -> dict:
@@ -263,7 +350,7 @@ def check_dependencies() -> dict:
     """
     deps = {}
     
-    # FFmpeg (required for pydub MP3 export)
+    # FFmpeg (required for MP3 export)
     ffmpeg = find_ffmpeg()
     deps['ffmpeg'] = (ffmpeg is not None, ffmpeg)
     
@@ -282,4 +369,21 @@ def check_dependencies() -> dict:
     tesseract = shutil.which('tesseract')
     deps['tesseract'] = (tesseract is not None, tesseract)
     
-    return deps
\ No newline at end of file
+    return deps
+
+
+def refresh_env():
+    """Re-read HOME/LOCALAPPDATA/PROGRAMFILES/VIRTUAL_ENV after the environment changes"""
+    global _HOME, _LOCALAPPDATA, _PROGRAMFILES, _VIRTUAL_ENV, _PIPER_CANDIDATE_DIRS
+    _HOME = os.path.expanduser('~')
+    _LOCALAPPDATA = os.environ.get('LOCALAPPDATA')
+    _PROGRAMFILES = os.environ.get('PROGRAMFILES')
+    _VIRTUAL_ENV = os.environ.get('VIRTUAL_ENV')
+    _PIPER_CANDIDATE_DIRS = _piper_candidate_dirs()
+    clear_dependency_cache()
+
+
+def clear_dependency_cache():
+    """Forget cached dependency lookups, e.g. after the user installs something"""
+    find_ffmpeg.cache_clear()
+    find_piper.cache_clear()
\ No newline at end of file
@@ -2,7 +2,9 @@
 AI description prompts for Moondream
 """
 
-PROMPTS = {
+from types import MappingProxyType
+
+_PROMPTS = {
     "general": """Describe this image for a blind viewer watching a recorded lecture.
 
 Rules:
@@ -41,4 +43,28 @@ Using this text and what you see, describe the slide for a blind viewer:
 - Keep to 3-4 clear sentences
 
 Describe the slide:"""
-}
\ No newline at end of file
+}
+
+# Read-only view of the defaults; callers that edit prompts take a .copy()
+PROMPTS = MappingProxyType(_PROMPTS)
+
+# The default Slide + OCR template split around its placeholder once, so
+# filling it is a concatenation rather than a str.format parse
+_SLIDE_OCR_PRE, _SLIDE_OCR_POST = _PROMPTS["slide_ocr"].split("{ocr_text}")
+
+
+def slide_ocr_prompt(ocr_text: str, template: str = None) -> str:
+    """
+    Fill the Slide + OCR prompt with extracted slide text.
+    
+    Args:
+        ocr_text: Text extracted from the slide
+        template: Prompt template containing {ocr_text} (default: built-in prompt)
+        
+    Returns:
+        The prompt to send to the model
+    """
+    if template is None or template == _PROMPTS["slide_ocr"]:
+        return _SLIDE_OCR_PRE + ocr_text + _SLIDE_OCR_POST
+    # User-edited prompt - keep str.format semantics
+    return template.format(ocr_text=ocr_text)
\ No newline at end of file
@@ -7,14 +7,20 @@ and PyInstaller-bundled environments.
 
 import os
 import sys
+from functools import lru_cache
 from typing import Optional
 
+# Everything here depends only on how the process was launched, so each
+# lookup is cached for the life of the process.
 
+
+@lru_cache(maxsize=None)
 def is_frozen() -> bool:
     """Check if running as PyInstaller frozen executable."""
     return getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
 
 
+@lru_cache(maxsize=None)
 def get_resource_path(relative_path: str) -> str:
     """
     Get absolute path to a resource file.
@@ -35,6 +41,7 @@ def get_resource_path(relative_path: str) -> str:
     return os.path.join(base_path, relative_path)
 
 
+@lru_cache(maxsize=1)
 def get_icon_path() -> tuple:
     """
     Get paths to application icons.
@@ -61,12 +68,13 @@ def get_icon_path() -> tuple:
     return png_path, ico_path
 
 
+@lru_cache(maxsize=None)
 def get_data_dir() -> str:
     """
     Get the application data directory.
     
     This is where user data, settings, and caches should be stored.
-    Creates the directory if it doesn't exist.
+    The directory is created when this module is imported.
     
     Returns:
         Path to the application data directory
@@ -79,10 +87,10 @@ def get_data_dir() -> str:
     else:
         data_dir = os.path.expanduser('~/.local/share/padle')
     
-    os.makedirs(data_dir, exist_ok=True)
     return data_dir
 
 
+@lru_cache(maxsize=None)
 def get_app_dir() -> str:
     """
     Get the application installation directory.
@@ -96,6 +104,7 @@ def get_app_dir() -> str:
         return os.path.dirname(os.path.abspath(__file__))
 
 
+@lru_cache(maxsize=None)
 def get_bundled_executable(name: str) -> Optional[str]:
     """
     Get the path to a bundled executable.
@@ -125,4 +134,11 @@ def get_bundled_executable(name: str) -> Optional[str]:
         if os.path.isfile(local_path):
             return local_path
     
-    return None
\ No newline at end of file
+    return None
+
+
+# Create the data directory once up front instead of on every lookup
+try:
+    os.makedirs(get_data_dir(), exist_ok=True)
+except OSError:
+    pass
\ No newline at end of file
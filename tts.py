@@ -5,17 +5,45 @@ Cross-platform compatible (Windows, macOS, Linux)
 """
 
 import os
+import re
 import subprocess
 import tempfile
 import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from functools import lru_cache
+import numpy as np
 from config import PIPER_VOICES_DIR, PIPER_SPEED
-from platform_utils import is_windows, get_exe_name, get_venv_bin_dir, get_subprocess_flags
+from platform_utils import (
+    find_piper, get_raw_audio_player, get_subprocess_flags, play_audio_file
+)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+
+# Threads used to read voice configs during discovery
+VOICE_SCAN_WORKERS = 8
+
+# Voice filenames look like en_US-amy-medium.onnx: locale-name-quality[-...]
+_VOICE_RX = re.compile(r'^([^-]*)-([^-]*)-([^-]*)')
+
+# Short locale labels for display names
+_LOCALE_SHORT = {
+    "en_US": "US",
+    "en_GB": "UK",
+}
+
+
+@dataclass(frozen=True, slots=True)
 class VoiceInfo:
     """Information about a Piper voice"""
     name: str           # Display name (e.g., "Amy (US, Medium)")
@@ -25,16 +53,71 @@ class VoiceInfo:
     quality: str        # e.g., "medium"
     language: str       # e.g., "English"
     sample_rate: int    # e.g., 22050
+    display_name: str = field(init=False, repr=False, compare=False)  # Formatted name for UI display
+    
+    def __post_init__(self):
+        # Computed once here rather than on every UI refresh
+        locale_short = _LOCALE_SHORT.get(self.locale, self.locale)
+        object.__setattr__(self, 'display_name',
+                           f"{self.voice_name.title()} ({locale_short}, {self.quality})")
+
+
+@lru_cache(maxsize=256)
+def _encode_utf8(text: str) -> bytes:
+    """UTF-8 bytes for text; repeated phrases skip the re-encode"""
+    return text.encode('utf-8')
+
+
+def _load_json(path: str):
+    """Parse a JSON file as bytes, with orjson when it's installed"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def _load_voice_config(json_path: Optional[str]) -> Tuple[int, str]:
+    """
+    Read a voice's sample rate and language from its .onnx.json config.
+    
+    Args:
+        json_path: Path to the config, or None if the voice has none
+        
+    Returns:
+        (sample_rate, language), with defaults for anything missing or unreadable
+    """
+    sample_rate = 22050
+    language = "English"
     
-    @property
-    def display_name(self) -> str:
-        """Formatted name for UI display"""
-        locale_map = {
-            "en_US": "US",
-            "en_GB": "UK",
-        }
-        locale_short = locale_map.get(self.locale, self.locale)
-        return f"{self.voice_name.title()} ({locale_short}, {self.quality})"
+    if json_path is not None:
+        try:
+            config = _load_json(json_path)
+            sample_rate = config.get('audio', {}).get('sample_rate', 22050)
+            language = config.get('language', {}).get('name_english', 'English')
+        except Exception:
+            pass
+    
+    return sample_rate, language
+
+
+# Piper executables whose --json-input streaming failed (the Python
+# piper-tts CLI has no such flag); skipped for the rest of the process
+_NO_JSON_INPUT: Set[str] = set()
+
+
+# Scanned voices shared by all PiperTTS instances: (voices_dir, mtime_ns) -> voices
+_VOICES_CACHE: Dict[Tuple[str, int], List[VoiceInfo]] = {}
+
+
+def _forget_voices(voices_dir: str):
+    """Drop cached scans of voices_dir (any mtime)"""
+    for key in [k for k in _VOICES_CACHE if k[0] == voices_dir]:
+        del _VOICES_CACHE[key]
+
+
+def clear_piper_cache():
+    """Forget the cached piper location (and its --json-input support) so the next lookup searches again"""
+    find_piper.cache_clear()
+    _NO_JSON_INPUT.clear()
 
 
 class PiperTTS:
@@ -50,58 +133,38 @@ class PiperTTS:
         """
         self.voice_path = voice_path
         self.speed = speed or PIPER_SPEED
-        self._piper_cmd = None
-        self._voices_cache = None
+        self._sample_rates = {}  # voice path -> sample rate from its .json
+        
+        # Long-lived piper process fed JSON lines on stdin (see synthesize)
+        self._piper_proc: Optional[subprocess.Popen] = None
+        self._proc_key = None  # (voice_path, speed) the process was started with
+        self._proc_lines: Optional[queue.Queue] = None
+        self._proc_lock = threading.Lock()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Stop the persistent piper process, if one is running"""
+        proc, self._piper_proc = self._piper_proc, None
+        self._proc_key = None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
         
     def _find_piper(self) -> Optional[str]:
-        """Find piper executable (cross-platform)"""
-        if self._piper_cmd:
-            return self._piper_cmd
-        
-        exe_name = get_exe_name("piper")
-        bin_dir = get_venv_bin_dir()
-        
-        # Build list of candidate paths
-        candidates = [exe_name]  # In PATH
-        
-        # Check current virtual environment first
-        venv_path = os.environ.get("VIRTUAL_ENV")
-        if venv_path:
-            candidates.insert(0, os.path.join(venv_path, bin_dir, exe_name))
-        
-        # Common project locations (cross-platform)
-        home = os.path.expanduser("~")
-        project_dirs = ["Projects", "projects", "Dev", "dev"]
-        project_names = ["leadr", "padle", "video-captioner"]
-        
-        for proj_dir in project_dirs:
-            for proj_name in project_names:
-                venv_piper = os.path.join(home, proj_dir, proj_name, "venv", bin_dir, exe_name)
-                candidates.append(venv_piper)
-        
-        # User local bin (Linux/macOS)
-        if not is_windows():
-            candidates.append(os.path.join(home, ".local", "bin", "piper"))
-        
-        # Check each candidate
-        subprocess_flags = get_subprocess_flags()
-        for cmd in candidates:
-            try:
-                # On Windows, check if file exists before running
-                if os.path.isfile(cmd) or cmd == exe_name:
-                    kwargs = {
-                        'capture_output': True,
-                        'timeout': 5
-                    }
-                    kwargs.update(subprocess_flags)
-                    result = subprocess.run([cmd, "--help"], **kwargs)
-                    if result.returncode == 0:
-                        self._piper_cmd = cmd
-                        return cmd
-            except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
-                continue
-                
-        return None
+        """Find piper executable (cross-platform, cached once found)"""
+        return find_piper()
     
     def discover_voices(self, voices_dir: str = None) -> List[VoiceInfo]:
         """
@@ -114,46 +177,62 @@ class PiperTTS:
             List of VoiceInfo objects
         """
         voices_dir = voices_dir or PIPER_VOICES_DIR
-        voices = []
         
+        try:
+            mtime = os.stat(voices_dir).st_mtime_ns
+        except OSError:
+            return []
         if not os.path.isdir(voices_dir):
-            return voices
+            return []
         
-        # Find all .onnx files
-        for filename in os.listdir(voices_dir):
-            if not filename.endswith('.onnx'):
-                continue
-            
-            onnx_path = os.path.join(voices_dir, filename)
-            json_path = onnx_path + '.json'
+        # Adding or removing a voice file bumps the directory's mtime, which
+        # invalidates the entry automatically
+        key = (voices_dir, mtime)
+        voices = _VOICES_CACHE.get(key)
+        if voices is None:
+            voices = self._scan_voices(voices_dir)
+            _forget_voices(voices_dir)
+            _VOICES_CACHE[key] = voices
+        return list(voices)
+    
+    def _scan_voices(self, voices_dir: str) -> List[VoiceInfo]:
+        """Read voice info for every .onnx model in voices_dir"""
+        voices = []
+        
+        # One directory pass: collect the .onnx models and which configs exist,
+        # so there's no per-voice exists() check
+        with os.scandir(voices_dir) as it:
+            entries = list(it)
+        models = [e for e in entries if e.name.endswith('.onnx')]
+        json_names = {e.name for e in entries if e.name.endswith('.onnx.json')}
+        
+        # Config reads are I/O-bound, so overlap them across a few threads
+        json_paths = [
+            e.path + '.json' if e.name + '.json' in json_names else None
+            for e in models
+        ]
+        if len(json_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(VOICE_SCAN_WORKERS, len(json_paths))) as pool:
+                configs = list(pool.map(_load_voice_config, json_paths))
+        else:
+            configs = [_load_voice_config(p) for p in json_paths]
+        
+        for entry, (sample_rate, language) in zip(models, configs):
+            filename = entry.name
+            onnx_path = entry.path
             
             # Parse voice info from filename (e.g., en_US-amy-medium.onnx)
             base_name = filename[:-5]  # Remove .onnx
-            parts = base_name.split('-')
+            match = _VOICE_RX.match(base_name)
             
-            if len(parts) >= 3:
-                locale = parts[0]
-                voice_name = parts[1]
-                quality = parts[2]
+            if match:
+                locale, voice_name, quality = match.groups()
             else:
                 # Fallback for non-standard names
                 locale = "unknown"
                 voice_name = base_name
                 quality = "unknown"
             
-            # Try to read additional info from JSON config
-            sample_rate = 22050
-            language = "English"
-            
-            if os.path.exists(json_path):
-                try:
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                    sample_rate = config.get('audio', {}).get('sample_rate', 22050)
-                    language = config.get('language', {}).get('name_english', 'English')
-                except Exception:
-                    pass
-            
             voice = VoiceInfo(
                 name=base_name,
                 path=onnx_path,
@@ -177,13 +256,12 @@ class PiperTTS:
     
     def get_voices(self, voices_dir: str = None) -> List[VoiceInfo]:
         """Get available voices (cached)"""
-        if self._voices_cache is None:
-            self._voices_cache = self.discover_voices(voices_dir)
-        return self._voices_cache
+        return self.discover_voices(voices_dir)
     
     def refresh_voices(self, voices_dir: str = None) -> List[VoiceInfo]:
-        """Refresh the voice cache"""
-        self._voices_cache = None
+        """Refresh the voice cache (and re-detect the piper executable)"""
+        clear_piper_cache()
+        _forget_voices(voices_dir or PIPER_VOICES_DIR)
         return self.get_voices(voices_dir)
     
     def set_voice(self, voice_path: str):
@@ -210,6 +288,44 @@ class PiperTTS:
             return "No voice selected"
         return "Piper TTS: Ready"
     
+    def get_sample_rate(self) -> int:
+        """Sample rate of the current voice (from its .onnx.json, default 22050)"""
+        if self.voice_path not in self._sample_rates:
+            sample_rate = 22050
+            json_path = f"{self.voice_path}.json"
+            if self.voice_path and os.path.exists(json_path):
+                try:
+                    config = _load_json(json_path)
+                    sample_rate = config.get('audio', {}).get('sample_rate', 22050)
+                except Exception:
+                    pass
+            self._sample_rates[self.voice_path] = sample_rate
+        return self._sample_rates[self.voice_path]
+    
+    def _build_command(self, piper: str, *output_args: str) -> List[str]:
+        """Build a piper command line for the current voice and speed"""
+        cmd = [piper, "--model", self.voice_path, *output_args]
+        
+        # Add speed if not default
+        if self.speed != 1.0:
+            cmd.extend(["--length_scale", str(1.0 / self.speed)])
+        
+        return cmd
+    
+    def _check_ready(self) -> str:
+        """Return the piper executable, raising if synthesis can't run"""
+        piper = self._find_piper()
+        if not piper:
+            raise RuntimeError("Piper TTS not found")
+        
+        if not self.voice_path:
+            raise RuntimeError("No voice selected")
+        
+        if not os.path.exists(self.voice_path):
+            raise RuntimeError(f"Voice model not found: {self.voice_path}")
+        
+        return piper
+    
     def synthesize(self, text: str, output_path: str) -> bool:
         """
         Generate speech from text.
@@ -221,31 +337,122 @@ class PiperTTS:
         Returns:
             True on success, False on failure
         """
-        piper = self._find_piper()
-        if not piper:
-            raise RuntimeError("Piper TTS not found")
+        piper = self._check_ready()
         
-        if not self.voice_path:
-            raise RuntimeError("No voice selected")
+        # Reuse a running piper so the model is loaded once, not per utterance
+        if piper not in _NO_JSON_INPUT:
+            with self._proc_lock:
+                if self._synthesize_persistent(piper, text, output_path):
+                    return os.path.exists(output_path)
         
-        if not os.path.exists(self.voice_path):
-            raise RuntimeError(f"Voice model not found: {self.voice_path}")
+        try:
+            cmd = self._build_command(piper, "--output_file", output_path)
+            
+            # Run piper with text as stdin
+            # Audio goes to --output_file, so only stderr is worth keeping
+            kwargs = {
+                'input': _encode_utf8(text),
+                'stdout': subprocess.DEVNULL,
+                'stderr': subprocess.PIPE,
+                'timeout': 60  # 1 minute timeout per synthesis
+            }
+            kwargs.update(get_subprocess_flags())
+            
+            result = subprocess.run(cmd, **kwargs)
+            
+            if result.returncode != 0:
+                # The tail of piper's log holds the actual error
+                error = result.stderr[-4096:].decode('utf-8', errors='replace')
+                raise RuntimeError(f"Piper failed: {error}")
+            
+            return os.path.exists(output_path)
+            
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("TTS synthesis timed out")
+    
+    def _start_persistent(self, piper: str) -> Optional[subprocess.Popen]:
+        """Return the streaming piper process for the current voice/speed, starting it if needed"""
+        key = (self.voice_path, self.speed)
+        if self._piper_proc is not None and self._piper_proc.poll() is None and self._proc_key == key:
+            return self._piper_proc
         
+        self.close()
+        cmd = self._build_command(piper, "--output_dir", tempfile.gettempdir(), "--json-input")
         try:
-            # Build piper command
-            cmd = [
-                piper,
-                "--model", self.voice_path,
-                "--output_file", output_path,
-            ]
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **get_subprocess_flags()
+            )
+        except OSError:
+            return None
+        
+        # Piper reports each finished file on stdout (C++ build) or as a
+        # "Wrote <path>" log line on stderr (Python build); watch both
+        lines = queue.Queue()
+        
+        def pump(stream):
+            for raw in iter(stream.readline, b''):
+                lines.put(raw.decode('utf-8', errors='replace'))
+            lines.put(None)  # Stream closed - process exited
+        
+        for stream in (proc.stdout, proc.stderr):
+            threading.Thread(target=pump, args=(stream,), daemon=True).start()
+        
+        self._piper_proc = proc
+        self._proc_key = key
+        self._proc_lines = lines
+        return proc
+    
+    def _synthesize_persistent(self, piper: str, text: str, output_path: str) -> bool:
+        """
+        Synthesize through the long-lived piper process.
+        
+        Returns:
+            True if piper reported writing output_path; False if streaming
+            isn't usable, in which case it is disabled for this executable
+        """
+        proc = self._start_persistent(piper)
+        if proc is not None:
+            request = json.dumps({"text": text, "output_file": output_path}) + "\n"
+            try:
+                proc.stdin.write(request.encode('utf-8'))
+                proc.stdin.flush()
+                
+                deadline = time.monotonic() + 60  # Same limit as a one-off run
+                while True:
+                    line = self._proc_lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                    if line is None:
+                        break
+                    if output_path in line:
+                        return True
+            except (OSError, queue.Empty):
+                pass
+        
+        # No --json-input support, crash or hang: fall back to one process per call
+        _NO_JSON_INPUT.add(piper)
+        self.close()
+        return False
+    
+    def synthesize_to_array(self, text: str) -> np.ndarray:
+        """
+        Generate speech as raw 16-bit mono samples, without touching disk.
+        
+        Args:
+            text: Text to synthesize
             
-            # Add speed if not default
-            if self.speed != 1.0:
-                cmd.extend(["--length_scale", str(1.0 / self.speed)])
+        Returns:
+            1-D int16 array at get_sample_rate() Hz
+        """
+        piper = self._check_ready()
+        
+        try:
+            cmd = self._build_command(piper, "--output_raw")
             
-            # Run piper with text as stdin
             kwargs = {
-                'input': text.encode('utf-8'),
+                'input': _encode_utf8(text),
                 'capture_output': True,
                 'timeout': 60  # 1 minute timeout per synthesis
             }
@@ -257,11 +464,88 @@ class PiperTTS:
                 error = result.stderr.decode('utf-8', errors='replace')
                 raise RuntimeError(f"Piper failed: {error}")
             
-            return os.path.exists(output_path)
+            # Drop a trailing odd byte rather than fail on a truncated stream
+            raw = result.stdout[:len(result.stdout) // 2 * 2]
+            return np.frombuffer(raw, dtype=np.int16)
             
         except subprocess.TimeoutExpired:
             raise RuntimeError("TTS synthesis timed out")
     
+    def synthesize_and_play(self, text: str) -> bool:
+        """
+        Speak text by piping piper's raw PCM straight into an audio player.
+        
+        No WAV file is written when a raw-capable player is available
+        (see get_raw_audio_player); otherwise falls back to a temp file
+        played with play_audio_file.
+        
+        Args:
+            text: Text to synthesize
+            
+        Returns:
+            True if audio was played, False if no audio player was found
+        """
+        player = get_raw_audio_player(self.get_sample_rate())
+        if player is None:
+            return self._play_via_temp(text)
+        
+        piper = self._check_ready()
+        flags = get_subprocess_flags()
+        
+        with tempfile.TemporaryFile() as errors:
+            synth = subprocess.Popen(
+                self._build_command(piper, "--output_raw"),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+                **flags
+            )
+            sink = subprocess.Popen(
+                player,
+                stdin=synth.stdout,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                **flags
+            )
+            # Only the player reads piper's stdout; closing our copy lets piper
+            # see a broken pipe if the player dies
+            synth.stdout.close()
+            
+            try:
+                synth.stdin.write(_encode_utf8(text))
+                synth.stdin.close()
+                synth.wait(timeout=60)
+                sink.wait(timeout=120)
+            except BrokenPipeError:
+                # Piper exited early; reap both so their exit codes are known
+                synth.wait(timeout=60)
+                sink.wait(timeout=120)
+            except subprocess.TimeoutExpired:
+                synth.kill()
+                sink.kill()
+                raise RuntimeError("TTS synthesis timed out")
+            
+            if sink.returncode != 0:
+                # Player couldn't open the device or rejected the format
+                # (piper then fails on the closed pipe too) - play a WAV instead
+                return self._play_via_temp(text)
+            
+            if synth.returncode != 0:
+                errors.seek(0)
+                error = errors.read().decode('utf-8', errors='replace')
+                raise RuntimeError(f"Piper failed: {error}")
+        
+        return True
+    
+    def _play_via_temp(self, text: str) -> bool:
+        """Synthesize to a temp WAV and play it with play_audio_file"""
+        temp_wav = self.synthesize_to_temp(text)
+        try:
+            return play_audio_file(temp_wav, blocking=True)
+        finally:
+            if os.path.exists(temp_wav):
+                os.unlink(temp_wav)
+    
     def synthesize_to_temp(self, text: str) -> str:
         """
         Generate speech to a temporary WAV file.
@@ -272,16 +556,19 @@ class PiperTTS:
         Returns:
             Path to temporary WAV file (caller must delete)
         """
-        fd, temp_path = tempfile.mkstemp(suffix='.wav')
-        os.close(fd)
+        # Closed on leaving the block so piper can open it on Windows too
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tf:
+            temp_path = tf.name
         
         try:
             self.synthesize(text, temp_path)
             return temp_path
         except Exception:
             # Clean up on failure
-            if os.path.exists(temp_path):
+            try:
                 os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
             raise
 
 
@@ -3,167 +3,474 @@ Video playback controller using OpenCV
 """
 
 import cv2
+import itertools
+import queue
 import threading
 import time
-from typing import Optional, Callable
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Optional, Callable, List, Tuple
 import numpy as np
 
+# Decoded frames waiting for the callback thread
+FRAME_QUEUE_SIZE = 2
+
+# Frames handed to the on_frame callback rotate through this many buffers:
+# the queued frames, plus the one being decoded, the one in the callback
+# and the one the preview may still be holding
+FRAME_RING_SIZE = FRAME_QUEUE_SIZE + 3
+
+# Forward seeks within this many seconds (about one keyframe interval) grab
+# frames instead of seeking, which would re-decode from the previous keyframe
+SEEK_GRAB_SECONDS = 2.0
+
+
+def _open_capture(filepath: str, backend: str) -> Optional[cv2.VideoCapture]:
+    """
+    Open filepath with the fastest decoder available.
+    
+    Args:
+        filepath: Video file to open
+        backend: "auto" tries FFmpeg hardware decoding, then plain software
+            decoding; "cpu" uses software decoding only
+            
+    Returns:
+        The capture, or None if nothing could open the file
+    """
+    if backend == "auto" and hasattr(cv2, 'VIDEO_ACCELERATION_ANY'):
+        # Lets FFmpeg use VAAPI / D3D11 / VideoToolbox etc. where available
+        cap = cv2.VideoCapture(filepath, cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    
+    cap = cv2.VideoCapture(filepath)
+    if cap.isOpened():
+        return cap
+    cap.release()
+    return None
+
 
 class VideoController:
-    """Handles video playback using OpenCV"""
+    """
+    Handles video playback using OpenCV.
+    
+    Only the decode thread touches self.cap. Other threads post commands
+    (load, seek, play, release...) to a deque that the decode thread drains
+    at the top of each iteration, so no lock guards the decoder. The
+    callbacks run only on the emit thread, so the decode thread never waits
+    on the UI while the UI waits on a command.
+    """
     
     def __init__(self):
         self.cap: Optional[cv2.VideoCapture] = None
         self.video_path: Optional[str] = None
         self.duration = 0
+        self.frame_count = 0
         self.fps = 30
-        self.current_position = 0
         self.is_playing = False
         self.playback_speed = 1.0
-        self.last_frame: Optional[np.ndarray] = None
         
-        self._lock = threading.Lock()
+        # (index of the displayed frame, last_frame), written only by the
+        # decode thread and replaced as a whole so readers never see the
+        # position of one frame paired with the image of another. The integer
+        # index is the source of truth; seconds are derived from it so
+        # repeated seeks don't accumulate float error (e.g. at 29.97 fps)
+        self._state: Tuple[int, Optional[np.ndarray]] = (0, None)
+        self._pending_frame: Optional[int] = None  # Target of a seek not yet applied
+        self._last_emitted: Optional[np.ndarray] = None  # Decoded frame last sent to on_frame (emit thread)
+        
+        self._analysis_size: Optional[Tuple[int, int]] = None
+        self._next_frame = 0  # Index of the frame the next read will return
+        self._frame_ring: List[np.ndarray] = []  # Allocated on the first frame
+        self._ring_seq = itertools.count()  # next() is atomic, so no lock needed
+        self._frame_queue: queue.Queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self._period_dirty = True  # Frame period needs recomputing from fps/speed
+        self._commands: deque = deque()  # (fn, Future, coalesce key) for the decode thread
+        self._wake = threading.Event()  # Rouses the decode thread early for commands/play
+        self._decode_thread: Optional[threading.Thread] = None
+        self._emit_thread: Optional[threading.Thread] = None
         self._is_running = True
         self._on_frame_callback: Optional[Callable] = None
         self._on_position_callback: Optional[Callable] = None
         self._on_end_callback: Optional[Callable] = None
     
-    def load(self, filepath: str) -> bool:
-        """Load a video file. Returns True on success."""
-        with self._lock:
-            if self.cap:
-                self.cap.release()
-            
-            self.cap = cv2.VideoCapture(filepath)
-            
-            if not self.cap.isOpened():
-                return False
-            
-            self.video_path = filepath
-            
-            # Detect actual FPS
-            detected_fps = self.cap.get(cv2.CAP_PROP_FPS)
-            if detected_fps and detected_fps > 0:
-                self.fps = detected_fps
-            else:
-                self.fps = 30
-            
-            total_frames = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            self.duration = total_frames / self.fps
-            self.current_position = 0
-            
-            return True
+    @property
+    def current_frame(self) -> int:
+        """Frame index of the current position (including a seek still in flight)"""
+        pending = self._pending_frame
+        return pending if pending is not None else self._state[0]
+    
+    @property
+    def current_position(self) -> float:
+        """Current position in seconds"""
+        return self.current_frame / self.fps
+    
+    def _frame_at(self, position: float) -> int:
+        """Nearest frame index to a position in seconds, clamped to the video"""
+        return max(0, min(round(position * self.fps), self.frame_count - 1))
+    
+    def _resume_frame(self) -> int:
+        """Index of the frame playback should show next"""
+        frame_num, frame = self._state
+        # Continue after the displayed frame; if nothing's been shown yet, start on it
+        return frame_num + 1 if frame is not None else frame_num
+    
+    @property
+    def last_frame(self) -> Optional[np.ndarray]:
+        """The last decoded frame (BGR), or None"""
+        return self._state[1]
+    
+    def load(self, filepath: str, backend: str = "auto") -> bool:
+        """
+        Load a video file. Returns True on success.
+        
+        Args:
+            filepath: Video file to open
+            backend: "auto" (hardware decoding when available) or "cpu"
+        """
+        return self._call(lambda: self._open(filepath, backend))
+    
+    def _open(self, filepath: str, backend: str) -> bool:
+        """Open a video (decode thread only)"""
+        if self.cap:
+            self.cap.release()
+        
+        self.cap = _open_capture(filepath, backend)
+        
+        if self.cap is None:
+            return False
+        
+        self.video_path = filepath
+        
+        # Detect actual FPS
+        detected_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        if detected_fps and detected_fps > 0:
+            self.fps = detected_fps
+        else:
+            self.fps = 30
+        
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.duration = self.frame_count / self.fps
+        self._state = (0, None)
+        self._pending_frame = None
+        self._last_emitted = None
+        self._next_frame = 0
+        self._period_dirty = True
+        
+        return True
     
     def set_callbacks(self, on_frame: Callable = None, on_position: Callable = None, 
                       on_end: Callable = None):
-        """Set callback functions for frame updates, position changes, and playback end"""
+        """
+        Set callback functions for frame updates, position changes, and playback end.
+        
+        on_frame receives one of FRAME_RING_SIZE reusable buffers, which is
+        overwritten FRAME_RING_SIZE frames later - use it promptly or copy it.
+        """
         self._on_frame_callback = on_frame
         self._on_position_callback = on_position
         self._on_end_callback = on_end
     
+    def _post(self, fn: Callable, key: Optional[str] = None) -> Future:
+        """
+        Queue fn to run on the decode thread; returns a Future for its result.
+        
+        Of consecutive queued commands sharing a key, only the last one runs.
+        """
+        future = Future()
+        thread = self._decode_thread
+        if thread is None or not thread.is_alive() or thread is threading.current_thread():
+            # No decode thread (not started yet, or stopped) - run it here
+            self._run(fn, future)
+        else:
+            self._commands.append((fn, future, key))
+            self._wake.set()
+        return future
+    
+    def _call(self, fn: Callable):
+        """Run fn on the decode thread and wait for its result"""
+        future = self._post(fn)
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:
+                if not self._decode_thread.is_alive():
+                    # The thread exited before reaching our command
+                    self._run_commands()
+    
+    @staticmethod
+    def _run(fn: Callable, future: Future):
+        """Run fn, delivering its result or exception through future"""
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
+    
+    def _run_commands(self):
+        """Drain posted commands (decode thread, or whoever outlives it)"""
+        while True:
+            try:
+                fn, future, key = self._commands.popleft()
+            except IndexError:
+                return
+            # Scrubbing posts a burst of seeks - only the newest matters
+            if key is not None and self._commands and self._commands[0][2] == key:
+                future.set_result(None)
+                continue
+            self._run(fn, future)
+    
+    def _seek_decoder(self, frame_num: int):
+        """Position the decoder so the next read returns frame_num (decode thread only)"""
+        delta = frame_num - self._next_frame
+        if 0 <= delta <= self.fps * SEEK_GRAB_SECONDS:
+            # Short hop forward (or none): grab() skips the colour conversion
+            # and copy-out, and avoids re-decoding from the last keyframe
+            for _ in range(delta):
+                if not self.cap.grab():
+                    break
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+        self._next_frame = frame_num
+    
+    def _to_ring_buffer(self, frame: np.ndarray) -> np.ndarray:
+        """Copy frame into the next pre-allocated ring buffer"""
+        ring = self._frame_ring
+        if not ring or ring[0].shape != frame.shape:
+            ring = self._frame_ring = [np.empty_like(frame) for _ in range(FRAME_RING_SIZE)]
+        buf = ring[next(self._ring_seq) % FRAME_RING_SIZE]
+        np.copyto(buf, frame)
+        return buf
+    
+    def _queue_frame(self, item: tuple):
+        """Hand a decoded frame to the emitter, dropping the oldest if it's behind"""
+        try:
+            self._frame_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._frame_queue.put_nowait(item)
+    
+    def _drop_queued_frames(self, keep_seeks: bool = False):
+        """
+        Discard frames decoded before a pause or seek (decode thread only).
+        
+        Args:
+            keep_seeks: Keep queued seek results, so a pause right after a
+                seek still shows the frame sought to
+        """
+        kept = []
+        try:
+            while True:
+                item = self._frame_queue.get_nowait()
+                if keep_seeks and item[3]:
+                    kept.append(item)
+        except queue.Empty:
+            pass
+        for item in kept:
+            self._queue_frame(item)
+    
     def start_playback_thread(self):
-        """Start the video playback thread"""
-        def video_loop():
+        """
+        Start the video playback threads.
+        
+        One thread decodes and paces frames; the other runs the callbacks, so
+        a slow frame callback doesn't delay the next decode.
+        """
+        def decode_loop():
+            deadline = None
+            period = 1.0 / 30
+            skip_error = 0.0  # Fractional frames owed to the skip schedule
+            
+            while self._is_running:
+                self._run_commands()
+                
+                # Block while paused (or empty) until a command or play() arrives
+                if not self.is_playing or not self.cap:
+                    deadline = None
+                    self._wake.wait(timeout=0.1)
+                    self._wake.clear()
+                    continue
+                
+                # Posted since the drain above - apply it before decoding
+                if self._commands:
+                    continue
+                
+                if deadline is None or self._period_dirty:
+                    # Above 1x, keep the source frame rate and skip frames
+                    # instead - the decoder can't show every frame faster
+                    period = 1.0 / (self.fps * min(self.playback_speed, 1.0))
+                    self._period_dirty = False
+                    if deadline is None:
+                        deadline = time.monotonic()
+                
+                frame = None
+                position = 0
+                end_of_video = False
+                
+                # Bresenham-style schedule so e.g. 1.5x drops every other frame
+                skip_error += max(self.playback_speed - 1.0, 0.0)
+                skip = int(skip_error)
+                skip_error -= skip
+                
+                if self.cap.isOpened():
+                    # grab() decodes without the colour conversion and copy-out
+                    for _ in range(skip):
+                        if self.cap.grab():
+                            self._next_frame += 1
+                    ret, frame = self.cap.read()
+                    if ret:
+                        # Count frames here rather than asking the backend
+                        # for CAP_PROP_POS_FRAMES every frame; seeks resync it
+                        frame_num = self._next_frame
+                        self._next_frame += 1
+                    else:
+                        end_of_video = True
+                
+                if frame is not None:
+                    position = frame_num / self.fps
+                    self._state = (frame_num, frame)
+                    decoded = frame
+                    if self._on_frame_callback:
+                        frame = self._to_ring_buffer(frame)
+                    
+                    self._queue_frame((frame, position, decoded, False))
+                    if frame_num >= self.frame_count - 1:
+                        self._queue_frame((None, position, None, False))
+                elif end_of_video:
+                    self._queue_frame((None, position, None, False))
+                
+                # Pace against absolute deadlines so per-frame overhead doesn't
+                # accumulate as drift; after a long stall, resync instead of
+                # racing to catch up
+                deadline += period
+                sleep_time = deadline - time.monotonic()
+                if sleep_time > 0:
+                    # Commands (seek, pause, ...) cut the wait short
+                    self._wake.wait(sleep_time)
+                    self._wake.clear()
+                elif sleep_time < -period:
+                    deadline = time.monotonic()
+            
+            # Don't strand callers waiting on a command posted as we stopped
+            self._run_commands()
+        
+        def emit_loop():
             last_position_update = 0
             position_update_interval = 0.1  # Update timeline 10x per second, not every frame
             
             while self._is_running:
-                frame_start = time.time()
+                try:
+                    frame, position, decoded, is_seek = self._frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
                 
-                if self.is_playing and self.cap:
-                    frame = None
-                    position = 0
-                    end_of_video = False
-                    
-                    with self._lock:
-                        if self.cap.isOpened():
-                            ret, frame = self.cap.read()
-                            if ret:
-                                self.last_frame = frame
-                                frame_num = self.cap.get(cv2.CAP_PROP_POS_FRAMES)
-                                position = frame_num / self.fps
-                                self.current_position = position
-                            else:
-                                end_of_video = True
-                    
-                    if frame is not None:
-                        if position >= self.duration:
-                            if self._on_end_callback:
-                                self._on_end_callback()
-                            self.current_position = self.duration
-                        else:
-                            # Always update frame for smooth video
-                            if self._on_frame_callback:
-                                self._on_frame_callback(frame.copy())
-                            # Throttle timeline/position updates
-                            if frame_start - last_position_update >= position_update_interval:
-                                if self._on_position_callback:
-                                    self._on_position_callback()
-                                last_position_update = frame_start
-                    elif end_of_video:
-                        if self._on_end_callback:
-                            self._on_end_callback()
-                else:
-                    time.sleep(0.01)
+                if is_seek:
+                    self._emit_seek(frame, decoded)
+                    last_position_update = time.time()
                     continue
                 
-                # Maintain source fps for smooth playback, adjusted for speed
-                elapsed = time.time() - frame_start
-                target_frame_time = (1.0 / self.fps) / self.playback_speed
-                sleep_time = max(target_frame_time - elapsed, 0.001)
-                time.sleep(sleep_time)
+                if frame is None:
+                    if self._on_end_callback:
+                        self._on_end_callback()
+                    continue
+                
+                # Always update frame for smooth video
+                if self._on_frame_callback:
+                    self._on_frame_callback(frame)
+                    self._last_emitted = decoded
+                # Throttle timeline/position updates
+                now = time.time()
+                if now - last_position_update >= position_update_interval:
+                    if self._on_position_callback:
+                        self._on_position_callback()
+                    last_position_update = now
         
-        thread = threading.Thread(target=video_loop, daemon=True)
-        thread.start()
+        self._decode_thread = threading.Thread(target=decode_loop, daemon=True)
+        self._decode_thread.start()
+        self._emit_thread = threading.Thread(target=emit_loop, daemon=True)
+        self._emit_thread.start()
     
     def play(self):
         """Start video playback"""
         if not self.cap:
             return
         
-        # Seek to current position before starting playback
-        acquired = self._lock.acquire(timeout=0.1)
-        if acquired:
-            try:
-                frame_num = int(self.current_position * self.fps)
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            finally:
-                self._lock.release()
-        
+        # Continue from the frame after the displayed one (a no-op when the
+        # decoder is already there). Posted before is_playing is set, so the
+        # decode thread sees it before decoding
+        self._post(lambda: self._seek_decoder(self._resume_frame()))
         self.is_playing = True
+        self._wake.set()
     
     def pause(self):
         """Pause video playback"""
         self.is_playing = False
+        self._post(lambda: self._drop_queued_frames(keep_seeks=True))
     
     def seek(self, position: float):
         """Seek to a specific position in seconds"""
         if not self.cap:
             return
         
-        self.current_position = max(0, min(position, self.duration))
-        self._update_frame_from_position()
+        # The target travels with the command, so a frame the decode thread
+        # is finishing can't overwrite it; until then current_position
+        # reports the pending target
+        target = self._frame_at(position)
+        self._pending_frame = target
+        self._post(lambda: self._update_frame_from_position(target), key="seek")
     
-    def _update_frame_from_position(self):
-        """Update the current frame based on position"""
+    def _update_frame_from_position(self, frame_num: int):
+        """Decode frame_num and make it the current position (decode thread only)"""
         if not self.cap:
+            self._pending_frame = None
             return
         
-        acquired = self._lock.acquire(timeout=0.1)
-        if not acquired:
-            return
+        self._seek_decoder(frame_num)
+        self._drop_queued_frames()
         
-        try:
-            frame_num = int(self.current_position * self.fps)
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            
-            ret, frame = self.cap.read()
-            if ret:
-                self.last_frame = frame
-                if self._on_frame_callback:
-                    self._on_frame_callback(frame.copy())
-        finally:
-            self._lock.release()
+        ret, frame = self.cap.read()
+        ring_frame = None
+        if ret:
+            self._next_frame += 1
+            self._state = (frame_num, frame)
+            if self._on_frame_callback:
+                ring_frame = self._to_ring_buffer(frame)
+        else:
+            frame = None
+        
+        # Cleared only after _state holds the frame, so current_position never
+        # falls back to the old position in between (a newer seek keeps its own)
+        if self._pending_frame == frame_num:
+            self._pending_frame = None
+        
+        # The callbacks reach Tk, so they run on the emit thread like playback
+        # frames: a UI thread blocked in _call() can't deadlock against them
+        emitter = self._emit_thread
+        if emitter is not None and emitter.is_alive():
+            self._queue_frame((ring_frame, frame_num / self.fps, frame, True))
+        else:
+            self._emit_seek(ring_frame, frame)
+    
+    def _emit_seek(self, frame: Optional[np.ndarray], decoded: Optional[np.ndarray]):
+        """Show a seek's frame and report the new position (emit thread)"""
+        previous = self._last_emitted
+        # Scrubbing through a still scene while paused keeps decoding the
+        # picture already on screen - skip the redraw when nothing changed.
+        # Compare with what was last emitted, not last decoded: frames
+        # dropped from the queue at pause never reached the screen
+        unchanged = (
+            previous is not None
+            and decoded is not None
+            and previous.shape == decoded.shape
+            and np.array_equal(previous, decoded)
+        )
+        if frame is not None and self._on_frame_callback and not unchanged:
+            self._on_frame_callback(frame)
+            self._last_emitted = decoded
         
         if self._on_position_callback:
             self._on_position_callback()
@@ -175,20 +482,92 @@ class VideoController:
     def set_speed(self, speed: float):
         """Set playback speed (1.0 = normal)"""
         self.playback_speed = speed
+        self._period_dirty = True
+    
+    def set_analysis_size(self, width: Optional[int], height: Optional[int] = None):
+        """
+        Set the smallest frame size the vision model benefits from.
+        
+        Args:
+            width: Target width in pixels, or None to disable downscaling
+            height: Target height in pixels (defaults to width)
+        """
+        self._analysis_size = None if width is None else (width, height or width)
+    
+    def resize_for_analysis(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Downscale a frame so it still covers the analysis size.
+        
+        Both sides stay at least as large as the target (aspect ratio kept),
+        so the model sees the same detail after its own resize while far
+        fewer pixels are converted, hashed and uploaded.
+        
+        Args:
+            frame: BGR frame
+            
+        Returns:
+            The downscaled frame, or frame itself if it's already small enough
+        """
+        if self._analysis_size is None:
+            return frame
+        
+        target_w, target_h = self._analysis_size
+        h, w = frame.shape[:2]
+        scale = max(target_w / w, target_h / h)
+        if scale >= 1.0:
+            return frame
+        
+        size = (max(target_w, round(w * scale)), max(target_h, round(h * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
     
     def get_frame_at_position(self) -> Optional[np.ndarray]:
         """Get the current frame"""
         return self.last_frame.copy() if self.last_frame is not None else None
     
+    def get_frames_at_times(self, timestamps: List[float]) -> List[Optional[np.ndarray]]:
+        """
+        Read the frames at several positions, e.g. for batched analysis.
+        
+        Args:
+            timestamps: Positions in seconds
+            
+        Returns:
+            A frame (or None if it couldn't be read) for each timestamp, in order
+        """
+        return self._call(lambda: self._read_frames(timestamps))
+    
+    def _read_frames(self, timestamps: List[float]) -> List[Optional[np.ndarray]]:
+        """get_frames_at_times body (decode thread only)"""
+        frames: List[Optional[np.ndarray]] = [None] * len(timestamps)
+        if not self.cap:
+            return frames
+        
+        # Visit positions in order so nearby timestamps are short forward hops
+        for i in sorted(range(len(timestamps)), key=timestamps.__getitem__):
+            self._seek_decoder(self._frame_at(timestamps[i]))
+            ret, frame = self.cap.read()
+            if ret:
+                self._next_frame += 1
+                frames[i] = frame
+        
+        # Put the decoder back where playback expects it
+        self._seek_decoder(self._resume_frame())
+        
+        return frames
+    
     def stop(self):
         """Stop the video controller"""
         self._is_running = False
         self.is_playing = False
+        self._wake.set()
     
     def release(self):
         """Release video resources"""
-        self._is_running = False
-        with self._lock:
+        def close():
             if self.cap:
                 self.cap.release()
                 self.cap = None
+        
+        self._call(close)
+        self._is_running = False
+        self._wake.set()
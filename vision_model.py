@@ -8,19 +8,36 @@ Cross-platform compatible (Windows, macOS, Linux)
 Supports CUDA, MPS (Apple Silicon), and CPU inference.
 """
 
+import gc
 import os
 import sys
+import time
+import hashlib
 import logging
-from typing import Optional, Callable, Dict, Any
+import importlib.util
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# Image embeddings kept for repeat questions about the same frame
+ENCODE_CACHE_SIZE = 4
 
+# Seconds a get_model_cache_info() result is reused
+CACHE_INFO_TTL = 60
+
+_cache_info: Optional[Tuple[float, Dict[str, Any]]] = None  # (monotonic time, info)
+
+
+@lru_cache(maxsize=1)
 def _detect_device() -> str:
     """
     Auto-detect the best available device for inference.
     
+    The probe (which queries the CUDA driver / Metal) runs once per process.
+    
     Returns:
         Device string: "cuda", "mps", or "cpu"
     """
@@ -38,11 +55,13 @@ def _detect_device() -> str:
     return "cpu"
 
 
+@lru_cache(maxsize=None)
 def _get_dtype(device: str):
     """
     Get the appropriate dtype for the device.
     
-    CPU requires float32, GPU can use float16/bfloat16.
+    CPU requires float32, GPU can use float16/bfloat16. Ampere (SM 8.x) and
+    newer NVIDIA GPUs get bfloat16, which doesn't overflow on attention scores.
     """
     import torch
     
@@ -50,10 +69,26 @@ def _get_dtype(device: str):
         return torch.float32
     elif device == "mps":
         return torch.float16
+    elif torch.cuda.get_device_capability()[0] >= 8:
+        return torch.bfloat16
     else:
         return torch.float16
 
 
+def _free_accelerator_memory():
+    """Return freed tensor memory to the CUDA / MPS driver."""
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return  # torch was never imported, so nothing was allocated
+    
+    # Drop unreachable tensors first so their blocks can actually be released
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    if hasattr(torch, 'mps') and hasattr(torch.mps, 'empty_cache') and torch.backends.mps.is_available():
+        torch.mps.empty_cache()
+
+
 class MoondreamLocal:
     """
     Local Moondream vision-language model wrapper.
@@ -65,6 +100,9 @@ class MoondreamLocal:
     MODEL_ID = "vikhyatk/moondream2"
     MODEL_REVISION = "2024-08-26"
     
+    # Largest size the vision encoder resizes images to (a 2x2 grid of 378px crops)
+    INPUT_SIZE = (756, 756)
+    
     def __init__(self):
         """Initialize the model wrapper (model not loaded yet)."""
         self._model = None
@@ -73,6 +111,10 @@ class MoondreamLocal:
         self._dtype = None
         self._is_loading = False
         self._load_error: Optional[str] = None
+        self._enc_cache: "OrderedDict[bytes, Any]" = OrderedDict()  # LRU of image embeddings
+        self._lm_offloaded = False  # Text model parked in host RAM by soft_unload()
+        self._api: Optional[str] = None  # "answer_question" or "query", resolved at load
+        self._answer_fn: Optional[Callable] = None
     
     @property
     def is_loaded(self) -> bool:
@@ -162,19 +204,26 @@ class MoondreamLocal:
                 revision=self.MODEL_REVISION
             )
             
-            # Load model without device_map to preserve custom Moondream class
+            # Load model without device_map to preserve custom Moondream class.
+            # Weights are materialised shard by shard directly in the target
+            # dtype, instead of as a full float32 copy that is then cast
             self._model = AutoModelForCausalLM.from_pretrained(
                 self.MODEL_ID,
                 revision=self.MODEL_REVISION,
                 trust_remote_code=True,
+                torch_dtype=self._dtype,
+                low_cpu_mem_usage=True,
             )
             
             # Move to GPU if available (after loading to preserve custom methods)
             if self._device != "cpu":
-                import torch
                 self._model = self._model.to(self._device)
-                if self._device == "cuda":
-                    self._model = self._model.half()  # Use float16 on GPU for speed
+            
+            # Inference only - disable dropout and other training behaviour
+            self._model.eval()
+            
+            # Work out which Moondream API this revision has once, not per query
+            self._resolve_api()
             
             if progress_callback:
                 progress_callback("Model loaded successfully!")
@@ -194,6 +243,9 @@ class MoondreamLocal:
     
     def unload(self):
         """Unload the model to free memory."""
+        self._enc_cache.clear()
+        was_loaded = self._model is not None
+        
         if self._model is not None:
             del self._model
             self._model = None
@@ -201,12 +253,90 @@ class MoondreamLocal:
         if self._tokenizer is not None:
             del self._tokenizer
             self._tokenizer = None
+        
+        self._lm_offloaded = False
+        self._api = None
+        self._answer_fn = None
+        
+        if was_loaded:
+            _free_accelerator_memory()
+            logger.info("Moondream model unloaded")
+    
+    def _resolve_api(self):
+        """Bind the question-answering entry point of the loaded model."""
+        if hasattr(self._model, 'answer_question'):
+            # Old API (2024-08-26)
+            self._api = "answer_question"
+        elif hasattr(self._model, 'query'):
+            # Newer API
+            self._api = "query"
+        else:
+            self._api = None
+        self._answer_fn = getattr(self._model, self._api) if self._api else None
+        logger.info(f"Model type: {type(self._model).__name__}, using {self._api or 'no'} API")
+    
+    def soft_unload(self) -> bool:
+        """
+        Free GPU memory held by the language model while idle.
+        
+        The text model is moved to host RAM and the vision encoder stays on
+        the GPU. The next query moves the text model back, which is much
+        faster than reloading everything from disk.
+        
+        Returns:
+            True if GPU memory was released
+        """
+        text_model = getattr(self._model, 'text_model', None)
+        if text_model is None or self._device == "cpu" or self._lm_offloaded:
+            return False
+        
+        text_model.to("cpu")
+        self._lm_offloaded = True
+        _free_accelerator_memory()
+        logger.info("Moondream text model moved to host memory")
+        return True
+    
+    def _restore_text_model(self):
+        """Move the text model back to the device after soft_unload()."""
+        if self._lm_offloaded:
+            self._model.text_model.to(self._device)
+            self._lm_offloaded = False
+    
+    def encode(self, image: Image.Image):
+        """
+        Run the vision encoder on an image, reusing a recent result for
+        identical pixels.
+        
+        Args:
+            image: PIL Image to encode
             
-            import torch
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+        Returns:
+            The model's image embedding, for use with later queries
             
-            logger.info("Moondream model unloaded")
+        Raises:
+            RuntimeError: If model is not loaded
+        """
+        if self._model is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        
+        # Key on content, not id(): frames are rebuilt as new images each time
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        digest.update(f"{image.mode}{image.size}".encode())
+        key = digest.digest()
+        
+        enc_image = self._enc_cache.get(key)
+        if enc_image is not None:
+            self._enc_cache.move_to_end(key)
+            return enc_image
+        
+        import torch
+        with torch.inference_mode():
+            enc_image = self._model.encode_image(image)
+        
+        self._enc_cache[key] = enc_image
+        if len(self._enc_cache) > ENCODE_CACHE_SIZE:
+            self._enc_cache.popitem(last=False)
+        return enc_image
     
     def query(
         self,
@@ -231,33 +361,30 @@ class MoondreamLocal:
         if self._model is None:
             raise RuntimeError("Model not loaded. Call load() first.")
         
-        # Debug: log available methods
-        model_type = type(self._model).__name__
-        logger.info(f"Model type: {model_type}")
+        self._restore_text_model()
         
-        # Try different API versions
-        if hasattr(self._model, 'answer_question'):
-            # Old API (2024-08-26)
-            logger.info("Using answer_question API")
-            enc_image = self._model.encode_image(image)
-            answer = self._model.answer_question(
-                enc_image,
-                prompt,
-                self._tokenizer
-            )
-        elif hasattr(self._model, 'query'):
-            # Newer API
-            logger.info("Using query API")
-            result = self._model.query(image, prompt)
+        import torch
+        
+        if self._api == "answer_question":
+            enc_image = self.encode(image)
+            with torch.inference_mode():
+                answer = self._answer_fn(
+                    enc_image,
+                    prompt,
+                    self._tokenizer
+                )
+        elif self._api == "query":
+            with torch.inference_mode():
+                result = self._answer_fn(image, prompt)
             answer = result.get("answer", str(result))
         elif hasattr(self._model, 'generate'):
-            # Fallback: use generate with processor
-            logger.info("Using generate API fallback")
+            model_type = type(self._model).__name__
             raise RuntimeError(
                 f"Model loaded as {model_type} without Moondream methods. "
                 f"Available methods: {[m for m in dir(self._model) if not m.startswith('_')][:20]}"
             )
         else:
+            model_type = type(self._model).__name__
             available = [m for m in dir(self._model) if not m.startswith('_')][:20]
             raise RuntimeError(
                 f"Unknown model API. Type: {model_type}. "
@@ -266,6 +393,50 @@ class MoondreamLocal:
         
         return {"answer": answer}
     
+    def query_batch(
+        self,
+        images: List[Image.Image],
+        prompts: List[str],
+        settings: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Ask one question per image, running the vision encoder on all
+        images in a single batch when the model supports it.
+        
+        Args:
+            images: PIL Images to analyze
+            prompts: Question or instruction for each image
+            settings: Optional dict with temperature, max_tokens, top_p
+            
+        Returns:
+            List of dicts with "answer" key, in the same order as images
+            
+        Raises:
+            RuntimeError: If model is not loaded
+            ValueError: If images and prompts differ in length
+        """
+        if self._model is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        if len(images) != len(prompts):
+            raise ValueError("images and prompts must be the same length")
+        if not images:
+            return []
+        
+        self._restore_text_model()
+        
+        if hasattr(self._model, 'batch_answer'):
+            # Encodes the whole batch at once, then decodes with padded prompts
+            import torch
+            with torch.inference_mode():
+                answers = self._model.batch_answer(
+                    images=images,
+                    prompts=prompts,
+                    tokenizer=self._tokenizer
+                )
+            return [{"answer": answer} for answer in answers]
+        
+        return [self.query(image, prompt, settings) for image, prompt in zip(images, prompts)]
+    
     def caption(
         self,
         image: Image.Image,
@@ -325,16 +496,20 @@ def check_model_requirements() -> tuple[bool, str]:
     """
     missing = []
     
-    try:
-        import torch
-    except ImportError:
+    # find_spec checks installation without paying for the (slow) imports
+    if importlib.util.find_spec("torch") is None:
         missing.append("torch (PyTorch)")
     
-    try:
-        import transformers
-    except ImportError:
+    if importlib.util.find_spec("transformers") is None:
         missing.append("transformers")
     
+    # Needed for low_cpu_mem_usage loading of the safetensors weights
+    if importlib.util.find_spec("accelerate") is None:
+        missing.append("accelerate")
+    
+    if importlib.util.find_spec("safetensors") is None:
+        missing.append("safetensors")
+    
     if missing:
         return False, f"Missing packages: {', '.join(missing)}"
     
@@ -345,33 +520,44 @@ def get_model_cache_info() -> Dict[str, Any]:
     """
     Get information about the cached model.
     
+    Looks only at the model's own directory in the Hugging Face cache rather
+    than scanning every cached repo. Results are reused for
+    CACHE_INFO_TTL seconds.
+    
     Returns:
         Dict with cache_dir, is_cached, and estimated_size
     """
-    from huggingface_hub import scan_cache_dir, HfFolder
+    global _cache_info
+    
+    now = time.monotonic()
+    if _cache_info is not None and now - _cache_info[0] < CACHE_INFO_TTL:
+        return dict(_cache_info[1])
     
     cache_dir = os.environ.get(
         "HF_HOME",
         os.path.join(os.path.expanduser("~"), ".cache", "huggingface")
     )
+    repo_dir = os.path.join(
+        cache_dir, "hub", "models--" + MoondreamLocal.MODEL_ID.replace("/", "--")
+    )
     
-    model_cached = False
+    model_cached = os.path.isdir(repo_dir)
     model_size = 0
     
-    try:
-        cache_info = scan_cache_dir(cache_dir)
-        for repo in cache_info.repos:
-            if "moondream" in repo.repo_id.lower():
-                model_cached = True
-                model_size = repo.size_on_disk
-                break
-    except Exception:
-        pass
-    
-    return {
+    if model_cached:
+        # Snapshots are symlinks into blobs/, so only the blobs hold real data
+        try:
+            with os.scandir(os.path.join(repo_dir, "blobs")) as it:
+                model_size = sum(e.stat().st_size for e in it if e.is_file())
+        except OSError:
+            pass
+    
+    info = {
         "cache_dir": cache_dir,
         "is_cached": model_cached,
         "size_bytes": model_size,
         "size_mb": model_size / (1024 * 1024) if model_size else 0,
         "estimated_download_mb": 3740,
-    }
\ No newline at end of file
+    }
+    _cache_info = (now, info)
+    return dict(info)
\ No newline at end of file